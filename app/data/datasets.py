@@ -1,8 +1,11 @@
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import connect_database, bulk_insert, to_epoch, to_integer
 
 conn = connect_database()
 
+# Columns read back from datasets_metadata, in display order
+DATASET_COLUMNS = ["dataset_id", "name", "rows", "columns", "uploaded_by", "upload_date", "reported_by"]
+
 # Insert dataset
 def insert_dataset(conn, name, rows, columns, uploaded_by, upload_date, reported_by=None):
     """
@@ -11,10 +14,10 @@ def insert_dataset(conn, name, rows, columns, uploaded_by, upload_date, reported
     Args:
         conn: Database connection
         name TEXT NOT NULL,
-        rows TEXT,
-        columns TEXT,
+        rows INTEGER,
+        columns INTEGER,
         uploaded_by TEXT,
-        upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        upload_date: Upload date (ISO string, datetime or epoch seconds)
         reported_by: Username of reporter (optional)
 
     Returns:
@@ -29,13 +32,30 @@ def insert_dataset(conn, name, rows, columns, uploaded_by, upload_date, reported
             VALUES (?, ?, ?, ?, ?, ?)
             """
 
-    cursor.execute(insert_sql, (name, rows, columns, uploaded_by, upload_date, reported_by)) # Execute the SQL statement
+    cursor.execute(insert_sql, (name, to_integer(rows), to_integer(columns), uploaded_by, to_epoch(upload_date), reported_by)) # Execute the SQL statement
     conn.commit() # Save inserted data
 
     # Provides the incident ID
     incident_id = cursor.lastrowid
     return incident_id
 
+# Insert many datasets
+def insert_datasets(conn, datasets, batch_size=1000):
+    """
+    Insert many datasets in one transaction.
+
+    Args:
+        conn: Database connection
+        datasets: DataFrame, or iterable of tuples/dicts with the columns
+            name, rows, columns, uploaded_by, upload_date, reported_by
+        batch_size: Rows sent to SQLite per executemany call
+
+    Returns:
+        list[range]: IDs of the inserted datasets
+    """
+    columns = ["name", "rows", "columns", "uploaded_by", "upload_date", "reported_by"]
+    return bulk_insert(conn, "datasets_metadata", columns, datasets, batch_size, {"rows": to_integer, "columns": to_integer, "upload_date": to_epoch})
+
 # Get all datasets
 def get_all_datasets(conn):
     """
@@ -46,7 +66,8 @@ def get_all_datasets(conn):
     """
 
     # Use pandas to execute SQL and return a DataFrame
-    df = pd.read_sql_query("SELECT * FROM datasets_metadata", conn) # Execute the SQL statement
+    query = f"SELECT {', '.join(DATASET_COLUMNS)} FROM datasets_metadata ORDER BY dataset_id"
+    df = pd.read_sql_query(query, conn, parse_dates={"upload_date": {"unit": "s"}}) # Execute the SQL statement
     return df
 
 # Delete dataset
@@ -1,11 +1,265 @@
+import numbers
 import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
+import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parent.parent  # Root of project
 DATA_DIR = BASE_DIR / "data" /"DATA"
 DB_PATH = DATA_DIR / "intelligence_platform.db"
 
+class BatchingConnection(sqlite3.Connection):
+    """SQLite connection whose commit() waits for the outermost transaction() block."""
+    # Initializes the objects
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_depth = 0
+
+    # Commit
+    def commit(self):
+        """Commits now, unless a transaction() block will commit later."""
+        if self.batch_depth == 0:
+            super().commit()
+
+# To epoch
+def to_epoch(value):
+    """
+    Convert a date/time value to whole seconds since 1970-01-01 UTC.
+
+    Accepts epoch numbers (Python or NumPy), datetime objects and ISO
+    strings such as '2024-04-12' or '2024-04-12 19:00:00.000000'. Blank
+    values become None.
+    """
+    if value is None or value == "" or value != value:  # value != value catches NaN
+        return None
+    if isinstance(value, numbers.Real):
+        return int(value)
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).strip())
+    # Naive times are treated as UTC, the same as SQLite's date functions
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+# To number
+def _to_number(value, number_type):
+    if value is None or value != value:  # value != value catches NaN
+        return None
+    if isinstance(value, numbers.Real):
+        return number_type(value)
+    text = str(value).strip()
+    if text == "":
+        return None
+    return number_type(float(text))
+
+# To real
+def to_real(value):
+    """
+    Convert a number or numeric text to float for a REAL column.
+
+    Blank values become None, the same as when the columns were typed.
+    """
+    return _to_number(value, float)
+
+# To integer
+def to_integer(value):
+    """Convert a number or numeric text to int for an INTEGER column (blank values become None)."""
+    return _to_number(value, int)
+
 # Connect database
 def connect_database(db_path=DB_PATH):
     """Connect to SQLite database."""
-    return sqlite3.connect(str(db_path))
\ No newline at end of file
+    return sqlite3.connect(str(db_path), factory=BatchingConnection)
+
+# Transaction
+@contextmanager
+def transaction(conn):
+    """
+    Group several writes into one transaction with a single commit.
+
+    The insert/update/delete helpers still call conn.commit(), but on a
+    BatchingConnection those commits are deferred until the outermost
+    block exits. Nested blocks join the outer transaction.
+    """
+    if not isinstance(conn, BatchingConnection):
+        raise TypeError("transaction() needs a connection opened by connect_database().")
+
+    # Take the write lock up front so the batch cannot fail half-way with SQLITE_BUSY
+    if conn.batch_depth == 0 and not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    conn.batch_depth += 1
+    try:
+        yield conn
+    except BaseException:
+        conn.batch_depth -= 1
+        if conn.batch_depth == 0:
+            conn.rollback()
+        raise
+    conn.batch_depth -= 1
+    if conn.batch_depth == 0:
+        conn.commit() # One commit (and one sync) for the whole batch
+
+# Bulk insert
+def bulk_insert(conn, table, columns, rows, batch_size=1000, converters=None):
+    """
+    Insert many rows with executemany inside one transaction.
+
+    Args:
+        conn: Database connection from connect_database()
+        table: Name of the target table
+        columns: Columns to fill, in order (leave out the primary key)
+        rows: DataFrame, or any iterable of tuples or dicts; read lazily
+        batch_size: Rows passed to each executemany call
+        converters: Optional {column: function} applied to each value first
+
+    Returns:
+        list[range]: IDs assigned to the inserted rows, in insert order
+    """
+    columns = list(columns)
+
+    # Stream rows as tuples without building a full list in memory
+    if hasattr(rows, "itertuples"):
+        # Columns the frame lacks (e.g. an optional reported_by) become None, like row.get() below
+        frame = rows.reindex(columns=columns)
+        missing = [column for column in columns if column not in rows.columns]
+        if missing:
+            frame[missing] = None
+        params = frame.itertuples(index=False, name=None)
+    else:
+        params = (
+            tuple(row.get(column) for column in columns) if isinstance(row, dict) else tuple(row)
+            for row in rows
+        )
+
+    # Convert values (e.g. dates to epoch seconds) as they stream past
+    if converters:
+        positions = [(columns.index(column), convert) for column, convert in converters.items()]
+
+        def convert_row(row):
+            row = list(row)
+            for position, convert in positions:
+                row[position] = convert(row[position])
+            return tuple(row)
+
+        params = map(convert_row, params)
+
+    insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    id_ranges = []
+    cursor = conn.cursor()
+    with transaction(conn):
+        while True:
+            cursor.executemany(insert_sql, islice(params, batch_size))
+            inserted = cursor.rowcount
+            if inserted <= 0:
+                break
+            # Inside one write transaction the new row IDs are consecutive
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_id = last_id - inserted + 1
+            if id_ranges and id_ranges[-1].stop == first_id:
+                id_ranges[-1] = range(id_ranges[-1].start, last_id + 1)
+            else:
+                id_ranges.append(range(first_id, last_id + 1))
+            if inserted < batch_size:
+                break
+    return id_ranges
+
+# Filter clauses
+def _filter_clauses(filters=None, time_column=None, start=None, end=None):
+    """Build the WHERE conditions and parameters shared by fetch_page and count_rows."""
+    clauses, params = [], []
+    for column, value in (filters or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if start is not None:
+        clauses.append(f"{time_column} >= ?")
+        params.append(to_epoch(start))
+    if end is not None:
+        clauses.append(f"{time_column} < ?")
+        params.append(to_epoch(end))
+    return clauses, params
+
+# Sort cursor clause
+def _after_sorted(sort_column, key, after, descending):
+    """
+    Build the condition for rows after (sort value, key) in sort order.
+
+    SQLite puts NULLs first when sorting ascending and last when sorting
+    descending, and the key breaks ties, so every row has one place in the order.
+    """
+    value, last_key = after
+    if not descending:
+        if value is None:
+            return f"(({sort_column} IS NULL AND {key} > ?) OR {sort_column} IS NOT NULL)", [last_key]
+        return f"({sort_column} > ? OR ({sort_column} = ? AND {key} > ?))", [value, value, last_key]
+    if value is None:
+        return f"({sort_column} IS NULL AND {key} < ?)", [last_key]
+    return (f"({sort_column} < ? OR ({sort_column} = ? AND {key} < ?) OR {sort_column} IS NULL)",
+            [value, value, last_key])
+
+# Fetch page
+def fetch_page(conn, table, columns, key, after=None, limit=50, filters=None, time_column=None, start=None, end=None,
+               sort_column=None, descending=False):
+    """
+    Read one keyset page of a table.
+
+    Rows come back in key order (or sort_column order, ties broken by key)
+    starting after the `after` cursor, so every page costs a seek plus
+    `limit` rows however deep it is. Filters are pushed down into the
+    WHERE clause.
+
+    Args:
+        conn: Database connection
+        table: Table to read
+        columns: Columns to return (the key must be one of them)
+        key: Primary key column used as the page cursor
+        after: Key of the last row on the previous page, or (sort value, key)
+            when sort_column is set (None for the first page)
+        limit: Rows per page
+        filters: {column: value or list of values}; None values are ignored
+        time_column: Epoch-seconds column that start/end apply to
+        start: Only rows at or after this date/time
+        end: Only rows before this date/time
+        sort_column: Column to order by instead of the key
+        descending: Sort from the largest value down
+
+    Returns:
+        pandas.DataFrame: The page, with time_column parsed to datetimes
+    """
+    clauses, params = _filter_clauses(filters, time_column, start, end)
+    direction = "DESC" if descending else "ASC"
+    if sort_column is None or sort_column == key:
+        if after is not None:
+            if isinstance(after, tuple):
+                after = after[-1]
+            clauses.append(f"{key} {'<' if descending else '>'} ?")
+            params.append(after)
+        order = f"{key} {direction}"
+    else:
+        if after is not None:
+            clause, cursor_params = _after_sorted(sort_column, key, after, descending)
+            clauses.append(clause)
+            params.extend(cursor_params)
+        order = f"{sort_column} {direction}, {key} {direction}"
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = f"SELECT {', '.join(columns)} FROM {table} {where} ORDER BY {order} LIMIT ?"
+    params.append(limit)
+
+    parse_dates = {time_column: {"unit": "s"}} if time_column in columns else None
+    return pd.read_sql_query(query, conn, params=params, parse_dates=parse_dates)
+
+# Count rows
+def count_rows(conn, table, filters=None, time_column=None, start=None, end=None):
+    """Count the rows of a table that match the same filters fetch_page takes."""
+    clauses, params = _filter_clauses(filters, time_column, start, end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return conn.execute(f"SELECT COUNT(*) FROM {table} {where}", params).fetchone()[0]
@@ -0,0 +1,42 @@
+from typing import NamedTuple
+
+class Domain(NamedTuple):
+    """Describes how one platform domain is stored in the database."""
+    name: str
+    table: str
+    key: str
+    time_column: str
+    dimension: str
+    columns: tuple[str, ...]
+    rollup_table: str
+
+# Domains shown in the dashboard, keyed by their label in the domain selector
+DOMAINS = {
+    "Cybersecurity": Domain(
+        name="Cybersecurity",
+        table="cyber_incidents",
+        key="incident_id",
+        time_column="timestamp",
+        dimension="category",
+        columns=("incident_id", "timestamp", "severity", "category", "status", "description", "reported_by"),
+        rollup_table="incident_monthly_rollup",
+    ),
+    "Data Science": Domain(
+        name="Data Science",
+        table="datasets_metadata",
+        key="dataset_id",
+        time_column="upload_date",
+        dimension="uploaded_by",
+        columns=("dataset_id", "name", "rows", "columns", "uploaded_by", "upload_date", "reported_by"),
+        rollup_table="dataset_monthly_rollup",
+    ),
+    "IT Operations": Domain(
+        name="IT Operations",
+        table="it_tickets",
+        key="ticket_id",
+        time_column="created_at",
+        dimension="status",
+        columns=("ticket_id", "priority", "description", "status", "assigned_to", "created_at", "resolution_time_hours", "reported_by"),
+        rollup_table="ticket_monthly_rollup",
+    ),
+}
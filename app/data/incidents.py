@@ -1,5 +1,9 @@
 import pandas as pd
 from app.data.db import *
+from app.data.search import search_table
+
+# Columns read back from cyber_incidents, in display order
+INCIDENT_COLUMNS = ["incident_id", "timestamp", "severity", "category", "status", "description", "reported_by"]
 
 conn = connect_database()
 
@@ -10,7 +14,7 @@ def insert_incident(conn, timestamp, severity, category, status, description, re
 
     Args:
         conn: Database connection
-        date: Incident date (YYYY-MM-DD)
+        timestamp: Incident date/time (ISO string, datetime or epoch seconds)
         incident_type: Type of incident
         severity: Severity level
         status: Current status
@@ -29,13 +33,30 @@ def insert_incident(conn, timestamp, severity, category, status, description, re
             VALUES (?, ?, ?, ?, ?, ?)
             """
 
-    cursor.execute(insert_sql, (timestamp, severity, category, status, description, reported_by))# Execute the SQL statement
+    cursor.execute(insert_sql, (to_epoch(timestamp), severity, category, status, description, reported_by))# Execute the SQL statement
     conn.commit() # Save inserted data
 
     # Return incident ID
     incident_id = cursor.lastrowid
     return incident_id
 
+# Insert many incidents
+def insert_incidents(conn, incidents, batch_size=1000):
+    """
+    Insert many cyber incidents in one transaction.
+
+    Args:
+        conn: Database connection
+        incidents: DataFrame, or iterable of tuples/dicts with the columns
+            timestamp, severity, category, status, description, reported_by
+        batch_size: Rows sent to SQLite per executemany call
+
+    Returns:
+        list[range]: IDs of the inserted incidents
+    """
+    columns = ["timestamp", "severity", "category", "status", "description", "reported_by"]
+    return bulk_insert(conn, "cyber_incidents", columns, incidents, batch_size, {"timestamp": to_epoch})
+
 # Get all incidents
 def get_all_incidents(conn):
     """
@@ -45,10 +66,26 @@ def get_all_incidents(conn):
         pandas.DataFrame: All incidents
     """
 
-    # Use pandas to execute SQL and return a DataFrame
-    df = pd.read_sql_query("SELECT * FROM cyber_incidents", conn)
+    # Use pandas to execute SQL and return a DataFrame (timestamps are stored as epoch seconds)
+    query = f"SELECT {', '.join(INCIDENT_COLUMNS)} FROM cyber_incidents ORDER BY incident_id"
+    df = pd.read_sql_query(query, conn, parse_dates={"timestamp": {"unit": "s"}})
     return df
 
+# Search incidents
+def search_incidents(conn, text, limit=20):
+    """
+    Full-text search over incident descriptions, best match first.
+
+    Args:
+        conn: Database connection
+        text: Words to look for (the last word also matches as a prefix)
+        limit: Maximum number of incidents to return
+
+    Returns:
+        pandas.DataFrame: Matching incidents with a `match` snippet and `rank`
+    """
+    return search_table(conn, "cyber_incidents_fts", "cyber_incidents", "incident_id", INCIDENT_COLUMNS, text, limit, "timestamp")
+
 # Update incident status
 def update_incident_status(conn, incident_id, new_status):
     """
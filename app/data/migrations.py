@@ -0,0 +1,135 @@
+from app.data.db import transaction
+from app.data.domains import DOMAINS
+from app.data.rollups import create_all_rollups
+from app.data.search import create_all_search_indexes
+from app.data.versions import create_table_versions
+from app.data.schema import (
+    create_users_table,
+    create_cyber_incidents_table,
+    create_datasets_metadata_table,
+    create_it_tickets_table,
+    create_indexes,
+)
+
+# Text timestamp (or a number that is already epoch seconds) -> epoch seconds
+def _epoch_sql(column):
+    return (f"CASE WHEN typeof({column}) IN ('integer', 'real') THEN CAST({column} AS INTEGER) "
+            f"ELSE CAST(strftime('%s', {column}) AS INTEGER) END")
+
+# Text number -> INTEGER/REAL, with blanks stored as NULL
+def _number_sql(column, sql_type):
+    return f"CAST(NULLIF(TRIM({column}), '') AS {sql_type})"
+
+# Columns converted while rebuilding each table: column -> SQL expression
+_CONVERSIONS = {
+    "cyber_incidents": {
+        "timestamp": _epoch_sql("timestamp"),
+    },
+    "it_tickets": {
+        "created_at": _epoch_sql("created_at"),
+        "resolution_time_hours": _number_sql("resolution_time_hours", "REAL"),
+    },
+    "datasets_metadata": {
+        "rows": _number_sql("rows", "INTEGER"),
+        "columns": _number_sql("columns", "INTEGER"),
+        "upload_date": _epoch_sql("upload_date"),
+    },
+}
+
+_CREATE_TABLE = {
+    "cyber_incidents": create_cyber_incidents_table,
+    "it_tickets": create_it_tickets_table,
+    "datasets_metadata": create_datasets_metadata_table,
+}
+
+# Version 1
+def _create_base_tables(conn):
+    """Create the tables (a database made before versioning already has them)."""
+    create_users_table(conn)
+    create_cyber_incidents_table(conn)
+    create_datasets_metadata_table(conn)
+    create_it_tickets_table(conn)
+
+# Version 2
+def _convert_column_types(conn):
+    """Rebuild the domain tables with INTEGER/REAL columns and epoch timestamps."""
+    cursor = conn.cursor()
+    for domain in DOMAINS.values():
+        table = domain.table
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+        row = cursor.fetchone()
+        sequence = row[0] if row else 0
+
+        # Move the old table aside, create the typed one and copy the rows across
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_untyped")
+        _CREATE_TABLE[table](conn)
+        conversions = _CONVERSIONS[table]
+        select = ", ".join(conversions.get(column, column) for column in domain.columns)
+        cursor.execute(f"""
+        INSERT INTO {table} ({', '.join(domain.columns)})
+        SELECT {select} FROM {table}_untyped
+        """)
+        # Dropping the old table also drops its indexes and triggers
+        cursor.execute(f"DROP TABLE {table}_untyped")
+
+        # Keep AUTOINCREMENT from reusing IDs of rows deleted before the rebuild
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence, table))
+
+# Ordered schema migrations: (version, description, step)
+MIGRATIONS = [
+    (1, "Create base tables", _create_base_tables),
+    (2, "Typed numeric columns and epoch timestamps", _convert_column_types),
+    (3, "Secondary indexes", create_indexes),
+    (4, "Monthly rollup tables", create_all_rollups),
+    (5, "Full-text search over incident and ticket descriptions", create_all_search_indexes),
+    (6, "Per-table version counters", create_table_versions),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# How long migrate() waits for a concurrent migration to finish before giving up
+MIGRATION_BUSY_TIMEOUT_MS = 120_000
+
+# Get schema version
+def get_schema_version(conn):
+    """Return the schema version stored in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+# Migrate
+def migrate(conn):
+    """
+    Apply any migrations the database has not had yet, in order.
+
+    Each migration runs in its own transaction together with the
+    PRAGMA user_version bump, so a failed step leaves the database at the
+    previous version. The version is read again once the write lock is
+    held, so sessions migrating at the same time apply each step once. A
+    database that is already current runs no DDL.
+
+    Returns:
+        int: Schema version after migrating
+    """
+    current = get_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return current
+
+    # Another session's migration can hold the write lock for longer than the usual busy timeout
+    busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    conn.execute(f"PRAGMA busy_timeout = {MIGRATION_BUSY_TIMEOUT_MS}")
+    try:
+        for version, description, step in MIGRATIONS:
+            if version <= current:
+                continue
+            with transaction(conn):
+                # Holding the write lock now: another session may have applied this step while we waited
+                current = get_schema_version(conn)
+                if version <= current:
+                    continue
+                print(f"🔧 Migrating database to version {version}: {description}")
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+            current = version
+    finally:
+        conn.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+    print(f"✅ Database schema is at version {current}")
+    return current
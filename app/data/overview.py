@@ -0,0 +1,62 @@
+import time
+import pandas as pd
+from app.data.domains import DOMAINS
+from app.data.rollups import get_monthly_matrix
+
+# Rows that still need attention, per domain (datasets have no status)
+OPEN_CONDITIONS = {
+    "Cybersecurity": "status NOT IN ('Closed', 'Resolved')",
+    "IT Operations": "status NOT IN ('Closed', 'Resolved')",
+}
+
+# Get domain summary
+def get_domain_summary(conn, domain_name, recent_days=30):
+    """
+    Read the headline numbers and monthly totals of one domain.
+
+    The counts are answered from the indexes on the time and status
+    columns rather than the table itself (still a scan of the index for
+    the total and open counts), and the monthly totals from the rollup table.
+
+    Args:
+        conn: Database connection
+        domain_name: Key of DOMAINS
+        recent_days: Window for the `recent` count
+
+    Returns:
+        dict: total, recent, open (None if the domain has no status),
+            top_dimension, and `monthly` (DataFrame of month, count)
+    """
+    domain = DOMAINS[domain_name]
+    cursor = conn.cursor()
+
+    cursor.execute(f"SELECT COUNT(*) FROM {domain.table}")
+    total = cursor.fetchone()[0]
+
+    since = int(time.time()) - recent_days * 86400
+    cursor.execute(f"SELECT COUNT(*) FROM {domain.table} WHERE {domain.time_column} >= ?", (since,))
+    recent = cursor.fetchone()[0]
+
+    open_count = None
+    if domain_name in OPEN_CONDITIONS:
+        cursor.execute(f"SELECT COUNT(*) FROM {domain.table} WHERE {OPEN_CONDITIONS[domain_name]}")
+        open_count = cursor.fetchone()[0]
+
+    cursor.execute(f"""
+    SELECT dimension FROM {domain.rollup_table}
+    GROUP BY dimension ORDER BY SUM(count) DESC LIMIT 1
+    """)
+    row = cursor.fetchone()
+    top_dimension = row[0] if row else None
+
+    # Totals over the dense month grid, so months with nothing in them chart as 0
+    matrix = get_monthly_matrix(conn, domain_name)
+    monthly = pd.DataFrame({"month": matrix.months.astype(str), "count": matrix.counts.sum(axis=1)})
+
+    return {
+        "total": total,
+        "recent": recent,
+        "open": open_count,
+        "top_dimension": top_dimension,
+        "monthly": monthly,
+    }
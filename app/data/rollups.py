@@ -0,0 +1,124 @@
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from app.data.db import transaction
+from app.data.domains import DOMAINS, Domain
+
+# Month key of a row, e.g. '2024-04'
+def month_sql(column):
+    """Return the SQL expression that buckets an epoch-seconds column by month."""
+    return f"strftime('%Y-%m', {column}, 'unixepoch')"
+
+# Create rollup table
+def create_rollup(conn, domain: Domain):
+    """
+    Create the monthly rollup table for a domain and the triggers that keep it current.
+
+    The table holds one row per (month, dimension) with the number of source
+    rows in it, so the dashboard charts read O(months x categories) rows.
+    """
+    rollup, table = domain.rollup_table, domain.table
+    new_month, old_month = month_sql(f"NEW.{domain.time_column}"), month_sql(f"OLD.{domain.time_column}")
+    new_dimension = f"IFNULL(NEW.{domain.dimension}, 'Unknown')"
+    old_dimension = f"IFNULL(OLD.{domain.dimension}, 'Unknown')"
+
+    # Adds one to the bucket of the NEW row (rows without a valid date are skipped)
+    add_new = f"""
+        INSERT INTO {rollup} (month, dimension, count)
+        SELECT {new_month}, {new_dimension}, 1
+        WHERE {new_month} IS NOT NULL
+        ON CONFLICT (month, dimension) DO UPDATE SET count = count + 1;
+    """
+    # Takes one from the bucket of the OLD row and drops buckets that reach zero
+    remove_old = f"""
+        UPDATE {rollup} SET count = count - 1
+        WHERE month = {old_month} AND dimension = {old_dimension};
+        DELETE FROM {rollup}
+        WHERE month = {old_month} AND dimension = {old_dimension} AND count <= 0;
+    """
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {rollup} (
+        month TEXT NOT NULL,
+        dimension TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (month, dimension)
+    ) WITHOUT ROWID
+    """)
+
+    # Recreate the triggers so changes to their definition take effect
+    for event in ("insert", "delete", "update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_rollup_{event}")
+    cursor.execute(f"""
+    CREATE TRIGGER trg_{table}_rollup_insert AFTER INSERT ON {table}
+    BEGIN {add_new} END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER trg_{table}_rollup_delete AFTER DELETE ON {table}
+    BEGIN {remove_old} END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER trg_{table}_rollup_update AFTER UPDATE OF {domain.time_column}, {domain.dimension} ON {table}
+    BEGIN {remove_old} {add_new} END
+    """)
+
+# Rebuild rollup
+def rebuild_rollup(conn, domain: Domain):
+    """Recount a domain's rollup table from its source table."""
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM {domain.rollup_table}")
+    cursor.execute(f"""
+    INSERT INTO {domain.rollup_table} (month, dimension, count)
+    SELECT {month_sql(domain.time_column)} AS month, IFNULL({domain.dimension}, 'Unknown'), COUNT(*)
+    FROM {domain.table}
+    WHERE month IS NOT NULL
+    GROUP BY 1, 2
+    """)
+
+# Create all rollups
+def create_all_rollups(conn):
+    """Create, wire up and backfill the rollup tables for every domain."""
+    with transaction(conn):
+        for domain in DOMAINS.values():
+            create_rollup(conn, domain)
+            rebuild_rollup(conn, domain)
+    print("✅ Monthly rollup tables created successfully!")
+
+class ChartMatrix(NamedTuple):
+    """Monthly counts as a dense months x categories grid, ready to chart."""
+    months: np.ndarray # datetime64[M], one per month from the first to the last, gaps included
+    categories: list[str]
+    counts: np.ndarray # int64, shape (len(months), len(categories)), 0 where nothing happened
+
+    # To frame
+    def to_frame(self):
+        """Return the grid as a DataFrame indexed by 'YYYY-MM' (no copy of the counts)."""
+        return pd.DataFrame(self.counts, index=pd.Index(self.months.astype(str), name="month"),
+                            columns=self.categories, copy=False)
+
+# Get monthly matrix
+def get_monthly_matrix(conn, domain_name):
+    """
+    Read a domain's rollup table into a dense ChartMatrix.
+
+    The rollup already holds one row per (month, dimension), so this is a
+    single small query; the grid is filled by index instead of a pivot, and
+    months with no rows get a row of zeros so the line chart has no gaps.
+    """
+    domain = DOMAINS[domain_name]
+    rows = conn.execute(f"SELECT month, dimension, count FROM {domain.rollup_table}").fetchall()
+    if not rows:
+        return ChartMatrix(np.empty(0, dtype="datetime64[M]"), [], np.zeros((0, 0), dtype=np.int64))
+
+    months, dimensions, counts = zip(*rows)
+    months = np.array(months, dtype="datetime64[M]")
+    categories, category_index = np.unique(np.array(dimensions, dtype=object), return_inverse=True)
+
+    first = months.min()
+    month_index = (months - first).astype(np.int64)
+    grid = np.zeros((month_index.max() + 1, len(categories)), dtype=np.int64)
+    grid[month_index, category_index] = counts # (month, dimension) is the primary key, so no duplicates
+
+    all_months = first + np.arange(grid.shape[0])
+    return ChartMatrix(all_months, [str(category) for category in categories], grid)
@@ -1,7 +1,50 @@
 import sqlite3
+import sys
 from pathlib import Path
 from app.data.db import *
 
+# Secondary indexes managed by create_indexes(): (name, table, columns)
+INDEXES = [
+    ("idx_incidents_category_timestamp", "cyber_incidents", ("category", "timestamp")),
+    ("idx_incidents_severity_status", "cyber_incidents", ("severity", "status")),
+    ("idx_incidents_status", "cyber_incidents", ("status",)),
+    ("idx_incidents_timestamp", "cyber_incidents", ("timestamp",)),
+    ("idx_tickets_status_created_at", "it_tickets", ("status", "created_at")),
+    ("idx_tickets_priority_status", "it_tickets", ("priority", "status")),
+    ("idx_tickets_created_at", "it_tickets", ("created_at",)),
+    ("idx_datasets_uploaded_by_upload_date", "datasets_metadata", ("uploaded_by", "upload_date")),
+    ("idx_datasets_upload_date", "datasets_metadata", ("upload_date",)),
+]
+
+# Queries the dashboards and analytics run, checked by advise_indexes(): name -> (sql, params)
+QUERY_CATALOGUE = {
+    "incidents_monthly_by_category": (
+        "SELECT strftime('%Y-%m', timestamp, 'unixepoch') as month, category, COUNT(*) as count "
+        "FROM cyber_incidents GROUP BY month, category ORDER BY month", ()),
+    "incidents_by_type_count": (
+        "SELECT category, COUNT(*) as count FROM cyber_incidents GROUP BY category ORDER BY count DESC", ()),
+    "incidents_high_severity_by_status": (
+        "SELECT status, COUNT(*) as count FROM cyber_incidents WHERE severity = 'High' "
+        "GROUP BY status ORDER BY count DESC", ()),
+    "incidents_by_status": (
+        "SELECT incident_id, timestamp, severity, category FROM cyber_incidents WHERE status = ?", ("Open",)),
+    "incidents_in_date_range": (
+        "SELECT COUNT(*) FROM cyber_incidents WHERE timestamp BETWEEN ? AND ?", (1704067200, 1735689599)),
+    "tickets_monthly_by_status": (
+        "SELECT strftime('%Y-%m', created_at, 'unixepoch') as month, status, COUNT(*) as count "
+        "FROM it_tickets GROUP BY month, status ORDER BY month", ()),
+    "tickets_high_priority_by_status": (
+        "SELECT status, COUNT(*) as count FROM it_tickets WHERE priority = 'High' "
+        "GROUP BY status ORDER BY count DESC", ()),
+    "tickets_by_status": (
+        "SELECT status, COUNT(*) as count FROM it_tickets GROUP BY status", ()),
+    "datasets_monthly_by_uploader": (
+        "SELECT strftime('%Y-%m', upload_date, 'unixepoch') as month, uploaded_by, COUNT(*) as count "
+        "FROM datasets_metadata GROUP BY month, uploaded_by ORDER BY month", ()),
+    "datasets_by_uploader": (
+        "SELECT upload_date FROM datasets_metadata WHERE uploaded_by = ? ORDER BY upload_date", ("data_scientist",)),
+}
+
 # Create users table
 def create_users_table(conn):
     """Create users table in database."""
@@ -27,7 +70,7 @@ def create_cyber_incidents_table(conn):
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS cyber_incidents (
             incident_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            timestamp INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
             severity TEXT NOT NULL,
             category TEXT NOT NULL,
             status TEXT NOT NULL,
@@ -47,15 +90,14 @@ def create_datasets_metadata_table(conn):
     """Create datasets_metadata table in database."""
     cursor = conn.cursor()
     try:
-        cursor.execute("""DROP TABLE IF EXISTS datasets_metadata""")
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS datasets_metadata (
             dataset_id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
-            rows TEXT,
-            columns TEXT,
+            rows INTEGER,
+            columns INTEGER,
             uploaded_by TEXT,
-            upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            upload_date INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
             reported_by TEXT
         )
         """)
@@ -79,8 +121,8 @@ def create_it_tickets_table(conn):
             description TEXT,
             status TEXT NOT NULL,
             assigned_to TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            resolution_time_hours TEXT,
+            created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+            resolution_time_hours REAL,
             reported_by TEXT  
         )
         """)
@@ -91,21 +133,93 @@ def create_it_tickets_table(conn):
         print("Failed to create It tickets table:", e)
         raise
 
+# Create indexes
+def create_indexes(conn):
+    """Create the managed secondary indexes and drop stale ones."""
+    cursor = conn.cursor()
+    managed_tables = {table for _, table, _ in INDEXES}
+    wanted = {name for name, _, _ in INDEXES}
+
+    # Drop managed indexes that are no longer in INDEXES
+    cursor.execute("SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+    for name, table in cursor.fetchall():
+        if table in managed_tables and name not in wanted:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    for name, table, columns in INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+    cursor.execute("ANALYZE") # Refresh the statistics the query planner uses
+    conn.commit() # Save inserted data
+    print(f"✅ {len(INDEXES)} indexes created successfully!")
+
+# Advise indexes
+def advise_indexes(conn, catalogue=None):
+    """
+    Run EXPLAIN QUERY PLAN over the query catalogue.
+
+    Args:
+        conn: Database connection
+        catalogue: {name: (sql, params)}, defaults to QUERY_CATALOGUE
+
+    Returns:
+        list[dict]: One entry per query with its plan, whether it still does
+            a full table scan, and whether it scans a whole index instead
+            (better, but still reads every entry)
+    """
+    cursor = conn.cursor()
+    report = []
+    for name, (sql, params) in (catalogue or QUERY_CATALOGUE).items():
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = [row[-1] for row in cursor.fetchall()]
+        # Every SCAN step reads a whole table or index; only SEARCH steps seek into one
+        scans = [step for step in plan if step.startswith("SCAN ") and step != "SCAN CONSTANT ROW"]
+        # "SCAN <table>" without "USING ... INDEX" reads every row of the table
+        full_scans = [step for step in scans if "USING" not in step]
+        report.append({"name": name, "sql": sql, "plan": plan, "full_scan": bool(full_scans),
+                       "index_scan": bool(scans) and not full_scans})
+    return report
+
+# Print index report
+def print_index_report(conn):
+    """Print the advisor report and return the number of full table scans found."""
+    report = advise_indexes(conn)
+    for entry in report:
+        if entry["full_scan"]:
+            label = "❌ FULL SCAN "
+        elif entry["index_scan"]:
+            label = "⚠️ INDEX SCAN"
+        else:
+            label = "✅ indexed   "
+        print(f"{label}  {entry['name']}")
+        for step in entry["plan"]:
+            print(f"      {step}")
+    full_scans = sum(entry["full_scan"] for entry in report)
+    index_scans = sum(entry["index_scan"] for entry in report)
+    print(f"\n{full_scans} of {len(report)} catalogued queries still do a full table scan, "
+          f"{index_scans} scan a whole index.")
+    return full_scans
+
 # Create all tables
 def create_all_tables(conn):
-    """Create all tables."""
+    """Create all tables, or bring an older database up to the current schema."""
+    # Imported here because the migrations are built from the functions above
+    from app.data.migrations import migrate
     try:
-        create_users_table(conn)
-        create_cyber_incidents_table(conn)
-        create_datasets_metadata_table(conn)
-        create_it_tickets_table(conn)
+        migrate(conn)
     except Exception as e:
         print("Table creation failed:", e)
         raise
 
 if __name__ == "__main__":
-    print("🔍 Initializing database...")
     conn = connect_database()
+    # python -m app.data.schema --advise
+    if "--advise" in sys.argv:
+        print("🔍 Checking query plans...")
+        full_scans = print_index_report(conn)
+        conn.close()
+        sys.exit(1 if full_scans else 0)
+
+    print("🔍 Initializing database...")
     create_all_tables(conn)
     conn.close()
     print(f"✅ Database initialized at: {DB_PATH.resolve()}")
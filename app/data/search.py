@@ -0,0 +1,104 @@
+import re
+import pandas as pd
+
+# Full-text indexes: (FTS table, source table, key column, indexed text column)
+SEARCH_INDEXES = [
+    ("cyber_incidents_fts", "cyber_incidents", "incident_id", "description"),
+    ("it_tickets_fts", "it_tickets", "ticket_id", "description"),
+]
+
+# Create search index
+def create_search_index(conn, fts_table, table, key, column):
+    """
+    Create an FTS5 index over one text column, kept in sync by triggers.
+
+    The index uses the source table as external content, so the text is not
+    stored twice; it only holds the inverted index used for MATCH queries.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+        {column},
+        content='{table}',
+        content_rowid='{key}',
+        tokenize='porter unicode61'
+    )
+    """)
+
+    for event in ("insert", "delete", "update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_{fts_table}_{event}")
+    cursor.execute(f"""
+    CREATE TRIGGER trg_{fts_table}_insert AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts_table} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER trg_{fts_table}_delete AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts_table} ({fts_table}, rowid, {column}) VALUES ('delete', OLD.{key}, OLD.{column});
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER trg_{fts_table}_update AFTER UPDATE OF {column} ON {table} BEGIN
+        INSERT INTO {fts_table} ({fts_table}, rowid, {column}) VALUES ('delete', OLD.{key}, OLD.{column});
+        INSERT INTO {fts_table} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+    END
+    """)
+
+    # Index the rows that already exist
+    cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+
+# Create all search indexes
+def create_all_search_indexes(conn):
+    """Create the full-text indexes for incident and ticket descriptions."""
+    for fts_table, table, key, column in SEARCH_INDEXES:
+        create_search_index(conn, fts_table, table, key, column)
+    conn.commit() # Save inserted data
+    print("✅ Full-text search indexes created successfully!")
+
+# Build match query
+def build_match_query(text, any_word=False):
+    """
+    Turn free text from a search box into a safe FTS5 query.
+
+    Every word must appear (in any order) and the last word also matches as
+    a prefix, so results show up while the user is still typing. With
+    any_word=True a row matches if it has any of the words (bm25 still ranks
+    rows with more of them first), which suits questions written as prose.
+    Returns None when the text has no searchable words.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if any_word:
+        return " OR ".join(terms)
+    terms[-1] += "*"
+    return " ".join(terms)
+
+# Search table
+def search_table(conn, fts_table, table, key, columns, text, limit=20, time_column=None, any_word=False):
+    """
+    Run a ranked full-text search and return the matching rows.
+
+    Returns:
+        pandas.DataFrame: Matching rows, best match first, with a `match`
+            snippet and the bm25 `rank` (lower is better)
+    """
+    match = build_match_query(text, any_word)
+    if match is None:
+        return pd.DataFrame(columns=[*columns, "match", "rank"])
+
+    selected = ", ".join(f"t.{column}" for column in columns)
+    query = f"""
+    SELECT {selected},
+           snippet({fts_table}, 0, '**', '**', '…', 12) AS match,
+           bm25({fts_table}) AS rank
+    FROM {fts_table}
+    JOIN {table} AS t ON t.{key} = {fts_table}.rowid
+    WHERE {fts_table} MATCH ?
+    ORDER BY rank
+    LIMIT ?
+    """
+    parse_dates = {time_column: {"unit": "s"}} if time_column else None
+    df = pd.read_sql_query(query, conn, params=(match, limit), parse_dates=parse_dates)
+    return df
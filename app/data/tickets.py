@@ -1,8 +1,12 @@
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import connect_database, bulk_insert, to_epoch, to_real
+from app.data.search import search_table
 
 conn = connect_database()
 
+# Columns read back from it_tickets, in display order
+TICKET_COLUMNS = ["ticket_id", "priority", "description", "status", "assigned_to", "created_at", "resolution_time_hours", "reported_by"]
+
 # Inset ticket
 def insert_ticket(conn, priority, description, status, assigned_to, created_at, resolution_time_hours, reported_by=None):
     """
@@ -14,8 +18,8 @@ def insert_ticket(conn, priority, description, status, assigned_to, created_at,
         description TEXT,
         status TEXT NOT NULL,
         assigned_to TEXT NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        resolution_time_hours TEXT
+        created_at: Date/time the ticket was raised (ISO string, datetime or epoch seconds)
+        resolution_time_hours REAL,
         reported_by: Username of reporter (optional)
 
     Returns:
@@ -30,13 +34,31 @@ def insert_ticket(conn, priority, description, status, assigned_to, created_at,
             VALUES (?, ?, ?, ?, ?, ?, ?)
             """
 
-    cursor.execute(insert_sql, (priority, description, status, assigned_to, created_at, resolution_time_hours, reported_by))# Execute the SQL statement
+    cursor.execute(insert_sql, (priority, description, status, assigned_to, to_epoch(created_at), to_real(resolution_time_hours), reported_by))# Execute the SQL statement
     conn.commit() # Save inserted data
 
     # Return ticket id
     ticket_id = cursor.lastrowid
     return ticket_id
 
+# Insert many tickets
+def insert_tickets(conn, tickets, batch_size=1000):
+    """
+    Insert many IT tickets in one transaction.
+
+    Args:
+        conn: Database connection
+        tickets: DataFrame, or iterable of tuples/dicts with the columns
+            priority, description, status, assigned_to, created_at,
+            resolution_time_hours, reported_by
+        batch_size: Rows sent to SQLite per executemany call
+
+    Returns:
+        list[range]: IDs of the inserted tickets
+    """
+    columns = ["priority", "description", "status", "assigned_to", "created_at", "resolution_time_hours", "reported_by"]
+    return bulk_insert(conn, "it_tickets", columns, tickets, batch_size, {"created_at": to_epoch, "resolution_time_hours": to_real})
+
 # Get all tickets
 def get_all_tickets(conn):
     """
@@ -47,9 +69,25 @@ def get_all_tickets(conn):
     """
 
     # Use pandas to execute SQL and return a DataFrame
-    df = pd.read_sql_query("SELECT * FROM it_tickets", conn)
+    query = f"SELECT {', '.join(TICKET_COLUMNS)} FROM it_tickets ORDER BY ticket_id"
+    df = pd.read_sql_query(query, conn, parse_dates={"created_at": {"unit": "s"}})
     return df
 
+# Search tickets
+def search_tickets(conn, text, limit=20):
+    """
+    Full-text search over ticket descriptions, best match first.
+
+    Args:
+        conn: Database connection
+        text: Words to look for (the last word also matches as a prefix)
+        limit: Maximum number of tickets to return
+
+    Returns:
+        pandas.DataFrame: Matching tickets with a `match` snippet and `rank`
+    """
+    return search_table(conn, "it_tickets_fts", "it_tickets", "ticket_id", TICKET_COLUMNS, text, limit, "created_at")
+
 # Update ticket status
 def update_ticket_status(conn, ticket_id, new_status):
     """
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from app.data.db import to_epoch
+from app.data.domains import DOMAINS
+
+# Bucket widths in seconds for the fixed-length granularities
+GRANULARITY_SECONDS = {
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+}
+GRANULARITIES = [*GRANULARITY_SECONDS, "month"]
+
+# Weeks start on Monday; 1970-01-05 was the first Monday after the epoch
+_WEEK_OFFSET = 4 * 86400
+
+# Bucket SQL
+def bucket_sql(column, granularity):
+    """Return the SQL expression giving the epoch second a row's bucket starts at."""
+    if granularity == "month":
+        return f"CAST(strftime('%s', {column}, 'unixepoch', 'start of month') AS INTEGER)"
+    if granularity == "week":
+        return f"(({column} - {_WEEK_OFFSET}) / {GRANULARITY_SECONDS['week']}) * {GRANULARITY_SECONDS['week']} + {_WEEK_OFFSET}"
+    step = GRANULARITY_SECONDS[granularity]
+    return f"({column} / {step}) * {step}"
+
+# All buckets
+def _all_buckets(first, last, granularity):
+    """Every bucket start from first to last, so empty buckets show as zero."""
+    if granularity == "month":
+        months = np.arange(np.datetime64(int(first), "s").astype("datetime64[M]"),
+                           np.datetime64(int(last), "s").astype("datetime64[M]") + 1)
+        return months.astype("datetime64[s]").astype(np.int64)
+    return np.arange(first, last + 1, GRANULARITY_SECONDS[granularity], dtype=np.int64)
+
+# Get time series
+def get_time_series(conn, domain_name, start=None, end=None, granularity="day"):
+    """
+    Count a domain's rows per time bucket and dimension, grouped in SQL.
+
+    Only rows in [start, end) are read (using the index on the time column),
+    and only one row per non-empty (bucket, dimension) comes back.
+
+    Returns:
+        tuple: (bucket starts as int64 epoch seconds, dimension labels,
+            int64 counts of shape (buckets, dimensions) with empty buckets as 0)
+    """
+    domain = DOMAINS[domain_name]
+    clauses, params = [f"{domain.time_column} IS NOT NULL"], []
+    if start is not None:
+        clauses.append(f"{domain.time_column} >= ?")
+        params.append(to_epoch(start))
+    if end is not None:
+        clauses.append(f"{domain.time_column} < ?")
+        params.append(to_epoch(end))
+
+    rows = conn.execute(f"""
+    SELECT {bucket_sql(domain.time_column, granularity)} AS bucket,
+           IFNULL({domain.dimension}, 'Unknown') AS dimension,
+           COUNT(*)
+    FROM {domain.table}
+    WHERE {' AND '.join(clauses)}
+    GROUP BY bucket, dimension
+    """, params).fetchall()
+    if not rows:
+        return np.empty(0, dtype=np.int64), [], np.zeros((0, 0), dtype=np.int64)
+
+    buckets, dimensions, counts = (np.array(values) for values in zip(*rows))
+    buckets = buckets.astype(np.int64)
+    labels, label_index = np.unique(dimensions.astype(str), return_inverse=True)
+
+    times = _all_buckets(buckets.min(), buckets.max(), granularity)
+    grid = np.zeros((len(times), len(labels)), dtype=np.int64)
+    grid[np.searchsorted(times, buckets), label_index] = counts
+    return times, labels.tolist(), grid
+
+# Largest-Triangle-Three-Buckets
+def lttb(x, y, threshold):
+    """
+    Pick at most `threshold` points of a series that keep its visual shape.
+
+    Keeps the first and last points, and from each of the threshold - 2
+    equal buckets in between the point forming the largest triangle with
+    the previously kept point and the average of the next bucket.
+
+    Returns:
+        numpy.ndarray: Indices of the kept points, in order
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    every = (n - 2) / (threshold - 2)
+    previous = 0
+    for i in range(threshold - 2):
+        bucket_start = int(i * every) + 1
+        bucket_end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        average_x = x[bucket_end:next_end].mean()
+        average_y = y[bucket_end:next_end].mean()
+
+        area = np.abs((x[previous] - average_x) * (y[bucket_start:bucket_end] - y[previous])
+                      - (x[previous] - x[bucket_start:bucket_end]) * (average_y - y[previous]))
+        previous = bucket_start + int(area.argmax())
+        kept[i + 1] = previous
+    return kept
+
+# Get downsampled series
+def get_downsampled_series(conn, domain_name, start=None, end=None, granularity="day", max_points=800):
+    """
+    Read a domain's time series and shrink every dimension to at most max_points points.
+
+    Returns:
+        pandas.DataFrame: time, dimension, count in long format, ready for
+            st.line_chart(df, x="time", y="count", color="dimension")
+    """
+    times, labels, grid = get_time_series(conn, domain_name, start, end, granularity)
+    frames = []
+    for column, label in enumerate(labels):
+        kept = lttb(times, grid[:, column], max_points)
+        frames.append(pd.DataFrame({
+            "time": times[kept].astype("datetime64[s]"),
+            "dimension": label,
+            "count": grid[kept, column],
+        }))
+    if not frames:
+        return pd.DataFrame({"time": pd.Series(dtype="datetime64[s]"), "dimension": pd.Series(dtype=object),
+                             "count": pd.Series(dtype=np.int64)})
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,40 @@
+from app.data.domains import DOMAINS
+
+# Create table versions
+def create_table_versions(conn):
+    """
+    Create a table_versions row per domain table, bumped by triggers on every write.
+
+    Unlike PRAGMA data_version, which changes whenever anything in the file
+    is committed, a table's version only changes when that table's rows do,
+    so caches keyed on it survive writes to other tables.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    for domain in DOMAINS.values():
+        table = domain.table
+        cursor.execute("INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)", (table,))
+        for event in ("insert", "update", "delete"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version_{event}")
+            cursor.execute(f"""
+            CREATE TRIGGER trg_{table}_version_{event} AFTER {event.upper()} ON {table} BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+            END
+            """)
+    print("✅ Table version triggers created successfully!")
+
+# Get table version
+def get_table_version(conn, table):
+    """
+    Return a counter that grows whenever a table's rows change.
+
+    The triggers fire once per row, so a write touching n rows adds n.
+    Returns 0 for a table without a version row.
+    """
+    row = conn.execute("SELECT version FROM table_versions WHERE table_name = ?", (table,)).fetchone()
+    return row[0] if row else 0
@@ -1,6 +1,7 @@
 import bcrypt
 from pathlib import Path
-from app.data.db import connect_database
+from app.data.db import connect_database, to_epoch
+from app.data.domains import DOMAINS
 from app.data.users import get_user_by_username, insert_user
 from app.data.schema import create_users_table
 import pandas as pd
@@ -155,6 +156,11 @@ def load_csv_to_table(conn, csv_path, table_name):
     # Read CSV into DataFrame
     df = pd.read_csv(csv_path)
 
+    # Store dates the way the table does (epoch seconds)
+    for domain in DOMAINS.values():
+        if domain.table == table_name and domain.time_column in df.columns:
+            df[domain.time_column] = df[domain.time_column].map(to_epoch).astype("Int64")
+
     # Read existing rows
     existing = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
 
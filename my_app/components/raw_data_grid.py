@@ -0,0 +1,83 @@
+import math
+from datetime import timedelta
+from typing import Any
+import streamlit as st
+from app.data.db import count_rows, fetch_page, to_epoch
+from app.data.domains import DOMAINS
+from my_app.models.lazy_result_set import LazyResultSet
+from my_app.services.database_manager import DatabaseManager
+from my_app.services.streamlit_cache import cached_fetch_all, cached_read
+
+# Cursor value
+def _cursor_value(value: Any, column: str, time_column: str) -> Any:
+    """Turns a value from the page DataFrame back into what is stored in SQLite."""
+    if column == time_column:
+        return to_epoch(value) # Parsed datetime -> epoch seconds
+    if isinstance(value, float) and math.isnan(value):
+        return None # NULL read into a float column
+    return value.item() if hasattr(value, "item") else value # NumPy scalar -> Python
+
+# Raw data grid
+def raw_data_grid(db: DatabaseManager, domain_name: str, repository, filter_columns: list[str], page_size: int = 50) -> LazyResultSet:
+    """
+    Show a domain table one page at a time, sorted, filtered and paged by SQLite.
+
+    Only the rows on screen are read and sent to the browser. Pages follow
+    a keyset cursor of (sort value, key), so the last page of a large table
+    costs the same as the first, and the matching row count is cached until
+    the data changes.
+
+    Returns:
+        LazyResultSet: The rows on screen, for the edit forms to look IDs up in
+    """
+    domain = DOMAINS[domain_name]
+    state_key = f"raw_{domain_name}"
+
+    # Filter controls (options come from the indexed columns)
+    controls = st.columns(len(filter_columns) + 3)
+    chosen = {}
+    for control, column in zip(controls, filter_columns):
+        options = [row[0] for row in cached_fetch_all(db, f"SELECT DISTINCT {column} FROM {domain.table} WHERE {column} IS NOT NULL ORDER BY {column}")]
+        with control:
+            value = st.selectbox(column.replace("_", " ").title(), ["All", *options], key=f"{state_key}_{column}")
+        chosen[column] = None if value == "All" else value
+    with controls[-3]:
+        dates = st.date_input("Date range", value=(), key=f"{state_key}_dates")
+    start, end = (dates[0], dates[1] + timedelta(days=1)) if len(dates) == 2 else (None, None)
+
+    # Sort controls
+    with controls[-2]:
+        sort_column = st.selectbox("Sort by", domain.columns, key=f"{state_key}_sort",
+                                   format_func=lambda column: column.replace("_", " ").title())
+    with controls[-1]:
+        descending = st.toggle("Descending", key=f"{state_key}_descending")
+
+    # Start again from the first page when the filters or the order change
+    view = (tuple(chosen.items()), start, end, sort_column, descending)
+    if st.session_state.get(f"{state_key}_view") != view:
+        st.session_state[f"{state_key}_cursors"] = [None]
+        st.session_state[f"{state_key}_view"] = view
+    cursors = st.session_state[f"{state_key}_cursors"]
+
+    total = cached_read(db, count_rows, domain.table, chosen, domain.time_column, start, end)
+    page = cached_read(db, fetch_page, domain.table, domain.columns, domain.key, cursors[-1], page_size, chosen,
+                       domain.time_column, start, end, sort_column, descending)
+    # Model objects are only built for the IDs the edit forms ask for
+    results = LazyResultSet(page, repository, domain.time_column)
+    st.dataframe(results.frame, hide_index=True)
+
+    pages = max(1, math.ceil(total / page_size))
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("◀ Previous", key=f"{state_key}_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(cursors)} of {pages} ({total} rows)")
+    with col_next:
+        if st.button("Next ▶", key=f"{state_key}_next", disabled=len(page) < page_size or len(cursors) >= pages):
+            last = page.iloc[-1]
+            cursors.append((_cursor_value(last[sort_column], sort_column, domain.time_column), int(last[domain.key])))
+            st.rerun()
+
+    return results
@@ -0,0 +1,33 @@
+from datetime import timedelta
+import streamlit as st
+from app.data.domains import DOMAINS
+from app.data.timeseries import GRANULARITIES, get_downsampled_series
+from my_app.services.database_manager import DatabaseManager
+from my_app.services.streamlit_cache import cached_read
+
+# Timeline chart
+def timeline_chart(db: DatabaseManager, domain_name: str, max_points: int = 800) -> None:
+    """
+    Chart a domain's rows over a chosen date range and granularity.
+
+    Counting happens in SQL for the selected range only, and each series is
+    cut down to max_points points (about one per pixel of chart width) with
+    LTTB, so even hourly data over several years draws quickly.
+    """
+    domain = DOMAINS[domain_name]
+    state_key = f"timeline_{domain_name}"
+
+    col_dates, col_granularity = st.columns([3, 1])
+    with col_dates:
+        dates = st.date_input("Date range", value=(), key=f"{state_key}_dates")
+    with col_granularity:
+        granularity = st.selectbox("Granularity", GRANULARITIES, index=GRANULARITIES.index("day"),
+                                   key=f"{state_key}_granularity", format_func=str.title)
+    start, end = (dates[0], dates[1] + timedelta(days=1)) if len(dates) == 2 else (None, None)
+
+    series = cached_read(db, get_downsampled_series, domain_name, start, end, granularity, max_points)
+    if series.empty:
+        st.info("No data in this range.")
+        return
+    st.line_chart(series, x="time", y="count", color="dimension")
+    st.caption(f"{domain.dimension.replace('_', ' ').title()} per {granularity}, at most {max_points} points per line")
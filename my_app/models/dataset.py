@@ -1,73 +1,83 @@
-from my_app.services.database_manager import DatabaseManager
-
 #conn, name, rows, columns, uploaded_by, upload_date, reported_by=None
-class Dataset(DatabaseManager):
+from app.data.db import to_integer
+
+class Dataset:
     """Represents a data science dataset in the platform."""
+    # One compact slot per field instead of a per-object __dict__
+    __slots__ = ("__db_path", "__id", "__name", "__rows", "__columns", "__source", "__upload_date", "__reported_by", "__weakref__")
+
     # Initializes the objects
-    def __init__(self, db_path: str, dataset_id: int | None, name: str, rows: int, columns: int, source: str, upload_date: str | None, reported_by: str | None):
-        super().__init__(db_path)
+    def __init__(self, db_path: str, dataset_id: int | None, name: str, rows: int | str | None, columns: int | str | None, source: str, upload_date: int | str | None, reported_by: str | None):
+        self.__db_path = db_path
         self.__id = dataset_id
         self.__name = name
-        self.__rows = rows
-        self.__columns = columns
+        self.__rows = to_integer(rows)
+        self.__columns = to_integer(columns)
         self.__source = source
         self.__upload_date = upload_date
         self.__reported_by = reported_by
 
-    # Get self
-    def get_self(datasets: list["Dataset"], dataset_id: str) -> str | None:
-        """Finds a dataset by its ID."""
-        self = 0
-        # Checks if the ID is in the datasets
-        if dataset_id.isdigit(): # Checks if the ID is a digit
-            for dataset in datasets:
-                if dataset.__id == int(dataset_id):
-                    return self
-                self += 1
-        return None
+    # Get ID
+    def get_id(self) -> int | None:
+        """Return the dataset ID."""
+        return self.__id
+
+    # Set ID
+    def set_id(self, dataset_id: int | None) -> None:
+        """Set the ID the database gave the dataset."""
+        self.__id = dataset_id
+
+    # Get database path
+    def get_db_path(self) -> str:
+        """Return the database the dataset is stored in."""
+        return self.__db_path
+
+    # Get name
+    def get_name(self) -> str:
+        """Retrieves the dataset name."""
+        return self.__name
+
+    # Get rows
+    def get_rows(self) -> int | None:
+        """Retrieves the number of rows in the dataset."""
+        return self.__rows
+
+    # Get columns
+    def get_columns(self) -> int | None:
+        """Retrieves the number of columns in the dataset."""
+        return self.__columns
 
     # Get source
     def get_source(self) -> str:
         """Retrieves the dataset source."""
         return self.__source
 
-    # Save changes
-    def save_changes(self, change_type: str) -> int | None:
-        """Add or delete the dataset into or from the database."""
-        if change_type.lower() == "add":
-            """Add a new dataset into the database."""
-            # If user chose not to enter reported by
-            if self.__reported_by == "":
-                self.__reported_by = None
-            # Parameterized SQL query to prevent SQL injection
-            insert_sql = """
-                    INSERT INTO datasets_metadata (name, rows, columns, uploaded_by, reported_by)
-                    VALUES (?, ?, ?, ?, ?)
-                    """
-
-            # Execute the SQL statement
-            cur = self.execute_query(
-                insert_sql,
-                (self.__name, self.__rows, self.__columns, self.__source, self.__reported_by,),
-            )
+    # Get upload date
+    def get_upload_date(self) -> int | str | None:
+        """Retrieves when the dataset was uploaded."""
+        return self.__upload_date
 
-            self.__id = cur.lastrowid
-            return self.__id
+    # Get reporter
+    def get_reporter(self) -> str | None:
+        """Retrieves who reported the dataset."""
+        return self.__reported_by
 
-        elif change_type.lower() == "delete":
-            """Remove the dataset from the database."""
-            # Parameterized DELETE query
-            delete_sql = """
-            DELETE FROM datasets_metadata
-            WHERE dataset_id = ?
-            """
+    # Refresh from
+    def refresh_from(self, other: "Dataset") -> None:
+        """Copies the field values of a freshly read copy of the same dataset."""
+        self.__name = other.get_name()
+        self.__rows = other.get_rows()
+        self.__columns = other.get_columns()
+        self.__source = other.get_source()
+        self.__upload_date = other.get_upload_date()
+        self.__reported_by = other.get_reporter()
 
-            cur = self.execute_query(delete_sql,(self.__id,)) # Execute the SQL statement
-            # Returns the ID
-            self.__id = cur.lastrowid
-            return self.__id
-
-        return None
+    # Save changes
+    def save_changes(self, change_type: str) -> int | None:
+        """Add or delete the dataset into or from the database."""
+        # Imported here because the repository module imports this one
+        from my_app.services.repositories import DatasetRepository
+        return DatasetRepository.for_path(self.__db_path).save(self, change_type)
 
     def __str__(self) -> str:
-        return f"Dataset {self.__id}: {self.__name}, row {self.__rows}, source [{self.__source}])"
\ No newline at end of file
+        return f"Dataset {self.__id}: {self.__name}, row {self.__rows}, source [{self.__source}])"
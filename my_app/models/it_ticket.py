@@ -1,17 +1,20 @@
-from my_app.services.database_manager import DatabaseManager
+from app.data.db import to_real
 
-class ITTicket(DatabaseManager):
+class ITTicket:
     """Represents an IT support ticket."""
+    # One compact slot per field instead of a per-object __dict__
+    __slots__ = ("__db_path", "__id", "__priority", "__description", "__status", "__assigned_to", "__created_at", "__resolution_time_hours", "__reported_by", "__weakref__")
+
     # Initializes the objects
-    def __init__(self, db_path: str, ticket_id: int | None, priority: str, description: str, status: str, assigned_to: str, created_at: str | None, resolution_time_hours: str, reported_by: str | None = None):
-        super().__init__(db_path)
+    def __init__(self, db_path: str, ticket_id: int | None, priority: str, description: str, status: str, assigned_to: str, created_at: int | str | None, resolution_time_hours: float | str | None, reported_by: str | None = None):
+        self.__db_path = db_path
         self.__id = ticket_id
         self.__priority = priority
         self.__description = description
         self.__status = status
         self.__assigned_to = assigned_to
         self.__created_at = created_at
-        self.__resolution_time_hours = resolution_time_hours
+        self.__resolution_time_hours = to_real(resolution_time_hours) # Blank form input is stored as NULL
         self.__reported_by = reported_by
 
     # Get ID
@@ -19,17 +22,45 @@ class ITTicket(DatabaseManager):
         """Return ID for the IT ticket."""
         return self.__id
 
-    # Get self
-    def get_self(tickets: list["ITTicket"], ticket_id: str) -> int | None:
-        """Get the IT ticket from the database using its ID."""
-        self = 0
-        # Checks if the ID is in the tickets
-        if ticket_id.isdigit(): # Checks if the ID is a digit
-            for ticket in tickets:
-                if ticket.__id == int(ticket_id):
-                    return self
-                self += 1
-        return None
+    # Set ID
+    def set_id(self, ticket_id: int | None) -> None:
+        """Set the ID the database gave the IT ticket."""
+        self.__id = ticket_id
+
+    # Get database path
+    def get_db_path(self) -> str:
+        """Return the database the IT ticket is stored in."""
+        return self.__db_path
+
+    # Get priority
+    def get_priority(self) -> str:
+        """Return the priority of the IT ticket."""
+        return self.__priority
+
+    # Get description
+    def get_description(self) -> str:
+        """Return the description of the IT ticket."""
+        return self.__description
+
+    # Get assigned to
+    def get_assigned_to(self) -> str:
+        """Return who the IT ticket is assigned to."""
+        return self.__assigned_to
+
+    # Get created at
+    def get_created_at(self) -> int | str | None:
+        """Return when the IT ticket was created."""
+        return self.__created_at
+
+    # Get resolution time
+    def get_resolution_time_hours(self) -> float | None:
+        """Return how many hours the IT ticket took to resolve."""
+        return self.__resolution_time_hours
+
+    # Get reporter
+    def get_reporter(self) -> str | None:
+        """Return who reported the IT ticket."""
+        return self.__reported_by
 
     # Assign to
     def assign_to(self, staff: str) -> None:
@@ -51,63 +82,33 @@ class ITTicket(DatabaseManager):
         """Update the status of the IT ticket."""
         self.__status = new_status
 
+    # Save status
+    def save_status(self, new_status: str) -> int | None:
+        """Saves a new status; this object only changes once the database has stored it."""
+        # Imported here because the repository module imports this one
+        from my_app.services.repositories import TicketRepository
+        return TicketRepository.for_path(self.__db_path).update_status(self, new_status)
+
+    # Refresh from
+    def refresh_from(self, other: "ITTicket") -> None:
+        """Copies the field values of a freshly read copy of the same ticket."""
+        self.__priority = other.get_priority()
+        self.__description = other.get_description()
+        self.__status = other.get_status()
+        self.__assigned_to = other.get_assigned_to()
+        self.__created_at = other.get_created_at()
+        self.__resolution_time_hours = other.get_resolution_time_hours()
+        self.__reported_by = other.get_reporter()
+
     # Save changes
     def save_changes(self, change_type: str) -> int | None:
         """Add, delete or update the IT ticket into or from the database."""
-        if change_type.lower() == "add":
-            """Add a new IT ticket into the database."""
-            if self.__reported_by == "":
-                self.__reported_by = None
-            # Parameterized SQL query to prevent SQL injection
-            insert_sql = """
-                    INSERT INTO it_tickets (priority, description, status, assigned_to, resolution_time_hours, reported_by)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """
-
-            # Execute the SQL statement
-            cur = self.execute_query(
-                insert_sql,
-                (self.__priority, self.__description, self.__status, self.__assigned_to, self.__resolution_time_hours, self.__reported_by),
-            )
-
-            # Return the ID
-            self.__id = cur.lastrowid
-            return self.__id
-
-        elif change_type.lower() == "delete":
-            """Remove the IT ticket from the database."""
-            # Parameterized DELETE query
-            delete_sql = """
-            DELETE FROM it_tickets
-            WHERE ticket_id = ?
-            """
-
-            # Execute the SQL statement
-            cur = self.execute_query(delete_sql,(self.__id,))
-            # Return ID
-            self.__id = cur.lastrowid
-            return self.__id
-
-        elif change_type.lower() == "update":
-            """Update the IT ticket status from the database."""
-
-            # Parameterized UPDATE query
-            update_sql = """
-                UPDATE it_tickets
-                SET status = ?
-                WHERE ticket_id = ?
-                """
-
-            # Execute the SQL statement
-            cur = self.execute_query(update_sql,(self.__status, self.__id,))
-            # Return ID
-            self.__id = cur.lastrowid
-            return self.__id
-
-        return None
+        # Imported here because the repository module imports this one
+        from my_app.services.repositories import TicketRepository
+        return TicketRepository.for_path(self.__db_path).save(self, change_type)
 
     def __str__(self) -> str:
         return (
         f"Ticket {self.__id} "
         f"[{self.__priority}] – {self.__status} (assigned to: {self.__assigned_to})"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,69 @@
+from typing import Any
+import pandas as pd
+from app.data.db import to_epoch
+
+class LazyResultSet:
+    """
+    One query result held once, as a DataFrame, with model objects built on demand.
+
+    The table on screen is drawn straight from `frame`, and a model object
+    is only created for a row when something asks for it by ID, e.g. the
+    "Check ID" button of an edit form.
+    """
+    # Initializes the objects
+    def __init__(self, frame: pd.DataFrame, repository, time_column: str | None = None):
+        self._frame = frame
+        self._repository = repository
+        self._time_column = time_column
+        self._positions: dict[int, int] | None = None
+
+    # Get frame
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The rows as read from the database (shared, not copied; don't modify it)."""
+        return self._frame
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    # Get positions
+    def _get_positions(self) -> dict[int, int]:
+        """Maps each ID on this result to its row number (built on first lookup)."""
+        if self._positions is None:
+            ids = self._frame[self._repository.key].to_numpy()
+            self._positions = {int(record_id): position for position, record_id in enumerate(ids)}
+        return self._positions
+
+    # Get
+    def get(self, record_id: int) -> Any | None:
+        """
+        Returns the model object for an ID on this result, or None if it is not here.
+
+        The object comes from the repository's shared identity map, so it is
+        refreshed with this frame's values before it is returned rather than
+        keeping whatever an earlier read left in it.
+        """
+        position = self._get_positions().get(record_id)
+        if position is None:
+            return None
+        record = self._frame.iloc[[position]].to_dict("records")[0] # Native Python values
+        row = []
+        for column in self._repository.columns:
+            value = record[column]
+            if column == self._time_column:
+                value = to_epoch(value) # Back to epoch seconds, as the repository stores it
+            elif value != value: # NaN from a NULL number
+                value = None
+            row.append(value)
+        return self._repository.hydrate(tuple(row))
+
+    # Find
+    def find(self, record_id: int | str) -> Any | None:
+        """Looks up an ID typed by the user, reading its current row from the database if it is not on this result."""
+        if isinstance(record_id, str):
+            record_id = record_id.strip()
+            if not record_id.isdigit(): # Checks if the ID is a digit
+                return None
+            record_id = int(record_id)
+        obj = self.get(record_id)
+        return obj if obj is not None else self._repository.get(record_id)
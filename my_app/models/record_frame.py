@@ -0,0 +1,223 @@
+from typing import Any, Iterable
+import numpy as np
+import pandas as pd
+
+# Epoch value used for a missing timestamp (the same bits as numpy's NaT)
+MISSING_TIME = np.iinfo(np.int64).min
+# Fixed-length datetime64 units in seconds (numpy weeks start on Thursday 1970-01-01)
+_UNIT_SECONDS = {"h": 3600, "D": 86400, "W": 7 * 86400}
+# Widest day range converted through a dense lookup table (about 270 years, 800 KB)
+_MAX_LOOKUP_DAYS = 100_000
+
+class RecordFrame:
+    """
+    Column-oriented table of records held as NumPy arrays.
+
+    Text columns with few distinct values are stored as categorical codes
+    (an int32 array plus the list of labels), timestamps as int64 epoch
+    seconds and numbers as float64, so filters and group-by counts run as
+    vectorized array operations instead of Python loops over objects.
+    """
+    table: str = ""
+    key: str = ""
+    time_column: str = ""
+    categorical: tuple[str, ...] = ()
+    numeric: tuple[str, ...] = ()
+
+    # Initializes the objects
+    def __init__(self, ids: np.ndarray, times: np.ndarray, codes: dict[str, np.ndarray],
+                 categories: dict[str, tuple[str, ...]], numbers: dict[str, np.ndarray]):
+        self.ids = ids
+        self.times = times
+        self.codes = codes
+        self.categories = categories
+        self.numbers = numbers
+
+    # From columns
+    @classmethod
+    def from_columns(cls, columns: dict[str, Iterable[Any]]) -> "RecordFrame":
+        """Builds a frame from {column: values}, e.g. one DataFrame or query result."""
+        ids = np.asarray(columns[cls.key], dtype=np.int64)
+
+        times = np.asarray(columns[cls.time_column], dtype=np.float64) # None -> NaN
+        times = np.where(np.isnan(times), MISSING_TIME, times).astype(np.int64)
+
+        codes, categories = {}, {}
+        for column in cls.categorical:
+            column_codes, labels = pd.factorize(np.asarray(columns[column], dtype=object), sort=True)
+            labels = [str(label) for label in labels]
+            if (column_codes < 0).any(): # NULLs get their own 'Unknown' label, as in the rollups
+                if "Unknown" not in labels:
+                    labels.append("Unknown")
+                column_codes = np.where(column_codes < 0, labels.index("Unknown"), column_codes)
+            codes[column] = column_codes.astype(np.int32)
+            categories[column] = tuple(labels)
+
+        # Blank or non-numeric text (from forms or older databases) becomes NaN
+        numbers = {column: pd.to_numeric(pd.Series(columns[column], dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+                   for column in cls.numeric}
+        return cls(ids, times, codes, categories, numbers)
+
+    # From database
+    @classmethod
+    def from_db(cls, db, batch_size: int = 10000) -> "RecordFrame":
+        """Reads the whole table through DatabaseManager.iter_arrays."""
+        names = (cls.key, cls.time_column, *cls.categorical, *cls.numeric)
+        chunks: dict[str, list[np.ndarray]] = {name: [] for name in names}
+        for chunk in db.iter_arrays(f"SELECT {', '.join(names)} FROM {cls.table} ORDER BY {cls.key}",
+                                    batch_size=batch_size):
+            for name in names:
+                chunks[name].append(chunk[name].astype(object))
+        columns = {name: np.concatenate(arrays) if arrays else np.empty(0, dtype=object)
+                   for name, arrays in chunks.items()}
+        return cls.from_columns(columns)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # Take
+    def take(self, selector: np.ndarray) -> "RecordFrame":
+        """Returns a new frame with the rows picked by a boolean mask or index array."""
+        return type(self)(
+            self.ids[selector],
+            self.times[selector],
+            {column: codes[selector] for column, codes in self.codes.items()},
+            self.categories, # Labels are shared, so codes stay comparable between frames
+            {column: values[selector] for column, values in self.numbers.items()},
+        )
+
+    # Mask
+    def mask(self, start: int | None = None, end: int | None = None, **conditions: str | Iterable[str]) -> np.ndarray:
+        """
+        Returns a boolean mask of the rows that match every condition.
+
+        Args:
+            start: Keep rows at or after this epoch second
+            end: Keep rows before this epoch second
+            **conditions: categorical column -> label or labels to keep
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if start is not None:
+            keep &= self.times >= start
+        if end is not None:
+            keep &= (self.times < end) & (self.times != MISSING_TIME)
+        for column, wanted in conditions.items():
+            labels = self.categories[column]
+            wanted = (wanted,) if isinstance(wanted, str) else tuple(wanted)
+            wanted_codes = [labels.index(label) for label in wanted if label in labels]
+            # A lookup table indexed by code is faster than np.isin for a handful of labels
+            lookup = np.zeros(len(labels), dtype=bool)
+            lookup[wanted_codes] = True
+            keep &= lookup[self.codes[column]]
+        return keep
+
+    # Filter
+    def filter(self, start: int | None = None, end: int | None = None, **conditions: str | Iterable[str]) -> "RecordFrame":
+        """
+        Returns a new frame with only the rows that match (see mask).
+
+        This copies every column; to count or aggregate, pass mask() as
+        `where` to the counting methods instead.
+        """
+        return self.take(self.mask(start, end, **conditions))
+
+    # Count
+    def count(self, start: int | None = None, end: int | None = None, **conditions: str | Iterable[str]) -> int:
+        """Returns how many rows match (see mask), without copying any column."""
+        return int(np.count_nonzero(self.mask(start, end, **conditions)))
+
+    # Count by
+    def count_by(self, column: str, where: np.ndarray | None = None) -> dict[str, int]:
+        """Returns the number of rows per label of a categorical column (only rows in the `where` mask, if given)."""
+        labels = self.categories[column]
+        codes = self.codes[column] if where is None else self.codes[column][where]
+        counts = np.bincount(codes, minlength=len(labels))
+        return dict(zip(labels, counts.tolist()))
+
+    # Labels
+    def labels(self, column: str) -> np.ndarray:
+        """Returns a categorical column decoded back to its text labels."""
+        return np.asarray(self.categories[column], dtype=object)[self.codes[column]]
+
+    # Time buckets
+    def time_buckets(self, unit: str = "D") -> np.ndarray:
+        """Returns each row's timestamp truncated to a datetime64 unit ('h', 'D', 'W', 'M' or 'Y')."""
+        return self.times.astype("datetime64[s]").astype(f"datetime64[{unit}]")
+
+    # Bucket numbers
+    def _bucket_numbers(self, unit: str, where: np.ndarray | None = None) -> np.ndarray:
+        """Returns the datetime64 bucket number of each row (in `where`, if given) that has a timestamp."""
+        times = self.times if where is None else self.times[where]
+        times = times[times != MISSING_TIME]
+        if unit in _UNIT_SECONDS:
+            return times // _UNIT_SECONDS[unit]
+        # Months and years have no fixed length: convert each distinct day once and look rows up
+        days = times // 86400
+        if len(days) == 0:
+            return days
+        first_day, last_day = days.min(), days.max()
+        if last_day - first_day < _MAX_LOOKUP_DAYS:
+            day_buckets = np.arange(first_day, last_day + 1).astype("datetime64[D]").astype(f"datetime64[{unit}]")
+            return day_buckets.astype(np.int64)[days - first_day]
+        # Outlying timestamps: only convert the days that occur
+        distinct_days, positions = np.unique(days, return_inverse=True)
+        return distinct_days.astype("datetime64[D]").astype(f"datetime64[{unit}]").astype(np.int64)[positions]
+
+    # Count by time
+    def count_by_time(self, unit: str = "D", where: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Counts rows (only those in the `where` mask, if given) per time bucket, including empty buckets in between.
+
+        Returns:
+            tuple: (datetime64 bucket starts, int64 counts); rows without a
+                timestamp are left out
+        """
+        buckets = self._bucket_numbers(unit, where)
+        if len(buckets) == 0:
+            return np.empty(0, dtype=f"datetime64[{unit}]"), np.empty(0, dtype=np.int64)
+        first = buckets.min()
+        counts = np.bincount(buckets - first)
+        starts = np.arange(first, first + len(counts)).astype(f"datetime64[{unit}]")
+        return starts, counts
+
+
+class IncidentFrame(RecordFrame):
+    """Columnar view of the cyber_incidents table."""
+    table = "cyber_incidents"
+    key = "incident_id"
+    time_column = "timestamp"
+    categorical = ("severity", "category", "status")
+
+    # Same levels as SecurityIncident.get_severity_level
+    SEVERITY_LEVELS = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+    # Severity scores
+    def severity_scores(self) -> np.ndarray:
+        """Returns the integer severity level of every row (0 if unknown)."""
+        levels = np.array([self.SEVERITY_LEVELS.get(label.lower(), 0) for label in self.categories["severity"]],
+                          dtype=np.int8)
+        return levels[self.codes["severity"]]
+
+
+class TicketFrame(RecordFrame):
+    """Columnar view of the it_tickets table."""
+    table = "it_tickets"
+    key = "ticket_id"
+    time_column = "created_at"
+    categorical = ("priority", "status", "assigned_to")
+    numeric = ("resolution_time_hours",)
+
+    # Mean resolution by
+    def mean_resolution_by(self, column: str, where: np.ndarray | None = None) -> dict[str, float]:
+        """Returns the average resolution time per label, ignoring tickets without one (and those outside `where`)."""
+        hours = self.numbers["resolution_time_hours"]
+        known = ~np.isnan(hours)
+        if where is not None:
+            known &= where
+        labels = self.categories[column]
+        codes = self.codes[column][known]
+        totals = np.bincount(codes, weights=hours[known], minlength=len(labels))
+        counts = np.bincount(codes, minlength=len(labels))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = totals / counts
+        return dict(zip(labels, means.tolist()))
@@ -1,10 +1,11 @@
-from my_app.services.database_manager import DatabaseManager
-
-class SecurityIncident(DatabaseManager):
+class SecurityIncident:
     """Represents a cybersecurity incident in the platform."""
+    # One compact slot per field instead of a per-object __dict__
+    __slots__ = ("__db_path", "__id", "__timestamp", "__incident_type", "__severity", "__status", "__description", "__reported_by", "__weakref__")
+
     # Initializes the objects
-    def __init__(self, db_path: str, incident_id: int | None, timestamp : str | None, incident_type: str, severity: str, status: str, description: str, reported_by: str | None):
-        super().__init__(db_path)
+    def __init__(self, db_path: str, incident_id: int | None, timestamp : int | str | None, incident_type: str, severity: str, status: str, description: str, reported_by: str | None):
+        self.__db_path = db_path
         self.__id = incident_id
         self.__timestamp = timestamp
         self.__incident_type = incident_type
@@ -18,23 +19,26 @@ class SecurityIncident(DatabaseManager):
         """Return the cybersecurity incident ID."""
         return self.__id
 
-    # Get self
-    def get_self(incidents: list["SecurityIncident"], incident_id: str) -> int | None:
-        """Get the cybersecurity incident using the ID"""
-        self = 0
-        # Checks if the ID is in the incidents
-        if incident_id.isdigit(): # Checks if the ID is a digit
-            for incident in incidents:
-                if incident.__id == int(incident_id):
-                    return self
-                self += 1
-        return None
+    # Set ID
+    def set_id(self, incident_id: int | None) -> None:
+        """Set the ID the database gave the cybersecurity incident."""
+        self.__id = incident_id
+
+    # Get database path
+    def get_db_path(self) -> str:
+        """Return the database the cybersecurity incident is stored in."""
+        return self.__db_path
 
     # Get timestamp
-    def get_timestamp(self) -> str:
+    def get_timestamp(self) -> int | str | None:
         """Return the cybersecurity incident timestamp."""
         return self.__timestamp
 
+    # Get category
+    def get_category(self) -> str:
+        """Return the cybersecurity incident type."""
+        return self.__incident_type
+
     # Get severity
     def get_severity(self) -> str:
         """Return the cybersecurity incident severity."""
@@ -60,6 +64,23 @@ class SecurityIncident(DatabaseManager):
         """Updates the cybersecurity incident status."""
         self.__status = new_status
 
+    # Save status
+    def save_status(self, new_status: str) -> int | None:
+        """Saves a new status; this object only changes once the database has stored it."""
+        # Imported here because the repository module imports this one
+        from my_app.services.repositories import IncidentRepository
+        return IncidentRepository.for_path(self.__db_path).update_status(self, new_status)
+
+    # Refresh from
+    def refresh_from(self, other: "SecurityIncident") -> None:
+        """Copies the field values of a freshly read copy of the same incident."""
+        self.__timestamp = other.get_timestamp()
+        self.__incident_type = other.get_category()
+        self.__severity = other.get_severity()
+        self.__status = other.get_status()
+        self.__description = other.get_description()
+        self.__reported_by = other.get_reporter()
+
     # Get severity level
     def get_severity_level(self) -> int:
         """Return an integer severity level (simple example)."""
@@ -74,58 +95,10 @@ class SecurityIncident(DatabaseManager):
     # Save changes
     def save_changes(self, change_type: str) -> int | None:
         """Add, delete or update the cybersecurity incident into the database."""
-        if change_type.lower() == "add":
-            """Add a new incident into the database."""
-            # If user chose not to enter reported by
-            if self.__reported_by == "":
-                self.__reported_by = None
-
-            # Parameterized SQL query to prevent SQL injection
-            insert_sql = """
-                        INSERT INTO cyber_incidents (severity, category, status, description, reported_by)
-                        VALUES (?, ?, ?, ?, ?)
-                        """
-
-            # Execute the SQL statement
-            cur = self.execute_query(
-                insert_sql,
-                (self.__severity, self.__incident_type, self.__status, self.__description, self.__reported_by,),
-            )
-
-            # Return ID
-            self.__id = cur.lastrowid
-            return self.__id
-
-        elif change_type.lower() == "delete":
-            """Remove the cybersecurity incident from the database."""
-            # Parameterized DELETE query
-            delete_sql = """
-                DELETE FROM cyber_incidents
-                WHERE incident_id = ?
-                """
-
-            cur = self.execute_query(delete_sql,(self.__id,)) # Execute the SQL statement
-            # Return ID
-            self.__id = cur.lastrowid
-            return self.__id
-
-        elif change_type.lower() == "update":
-            """Update the cybersecurity incident status from the database."""
-
-            # Parameterized UPDATE query
-            update_sql = """
-            UPDATE cyber_incidents
-            SET status = ?
-            WHERE incident_id = ?
-            """
-
-            cur = self.execute_query(update_sql,(self.__status, self.__id,)) # Execute the SQL statement
-            # Return ID
-            self.__id = cur.lastrowid
-            return self.__id
-
-        return None
+        # Imported here because the repository module imports this one
+        from my_app.services.repositories import IncidentRepository
+        return IncidentRepository.for_path(self.__db_path).save(self, change_type)
 
 
     def __str__(self) -> str:
-        return f"Incident {self.__id}, Type: {self.__incident_type}, [{self.__severity.upper()}], [{self.__status}], Description: {self.__description}"
\ No newline at end of file
+        return f"Incident {self.__id}, Type: {self.__incident_type}, [{self.__severity.upper()}], [{self.__status}], Description: {self.__description}"
@@ -1,12 +1,19 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 from time import sleep as pause
-from app.data.db import connect_database
+from app.data.incidents import search_incidents
+from app.data.tickets import search_tickets
+from app.data.migrations import migrate
+from app.data.rollups import get_monthly_matrix
 from my_app.services.database_manager import DatabaseManager
+from my_app.services.group_commit import enable_group_commit
+from my_app.services.streamlit_cache import cached_read
 from my_app.models.security_incident import SecurityIncident
 from my_app.models.dataset import Dataset
 from my_app.models.it_ticket import ITTicket
+from my_app.services.repositories import IncidentRepository, TicketRepository, DatasetRepository
+from my_app.components.raw_data_grid import raw_data_grid
+from my_app.components.timeline_chart import timeline_chart
 
 st.set_page_config(page_title="Dashboard", page_icon="📊 ",
 layout="wide")
@@ -24,8 +31,17 @@ if not st.session_state.logged_in:
         st.switch_page("Home.py") # back to the first page
     st.stop()
 
-# Setup database
-conn = connect_database()
+# Setup database (borrows connections from the shared pool)
+db = DatabaseManager("app/data/DATA/intelligence_platform.db")
+# Writes from every session share commits instead of paying one sync each
+enable_group_commit("app/data/DATA/intelligence_platform.db", window_ms=5, max_batch=64)
+# Bring the schema up to date (a single PRAGMA read when it is already current)
+with db.connection() as conn:
+    migrate(conn)
+# Load and save the model objects of each domain
+incidents_repository = IncidentRepository.for_path(db.db_path)
+datasets_repository = DatasetRepository.for_path(db.db_path)
+tickets_repository = TicketRepository.for_path(db.db_path)
 
 # If logged in, show dashboard content
 st.title("📊 Dashboard")
@@ -45,6 +61,9 @@ with st.sidebar:
         index=categories.index(st.session_state.selected_categories),
         key="selected_categories"
     )
+    # Result cache counters, for tuning its size
+    with st.expander("Query cache"):
+        st.json(db.cache_stats())
 st.write("Selected domain: ", st.session_state.selected_categories)
 
 if st.session_state.selected_categories == "NONE":
@@ -62,62 +81,37 @@ if st.session_state.selected_categories == "NONE":
 # ---------- Cybersecurity Display ----------
 elif st.session_state.selected_categories == "Cybersecurity":
 
-    # Connects databases
-    db = DatabaseManager("app/data/DATA/intelligence_platform.db")
-    db.connect()
-
     st.subheader("Cyber Incidents by Category (Monthly):")
 
     col1, col2 = st.columns(2)
-    # Group incidents by month and category for chart data
-    chart_data = """
-           SELECT strftime('%Y-%m', timestamp) as month, category, COUNT(*) as count
-           FROM cyber_incidents
-           GROUP BY month, category
-           ORDER BY month
-           """
-    # Connects to database to run chart_data and to make a dataframe
-    df = pd.read_sql_query(chart_data, conn)
+    # Monthly incident counts per category, kept current by triggers
+    matrix = cached_read(db, get_monthly_matrix, "Cybersecurity")
 
-    # Plots the charts
-    df_pivot = df.pivot(index="month", columns="category", values="count").fillna(0)
+    # Plots the charts (the matrix is already months x categories, gaps filled with 0)
+    df_chart = matrix.to_frame()
 
     # Show bar chart
     with col1:
         st.subheader("Line chart")
-        st.line_chart(df_pivot)
+        st.line_chart(df_chart)
 
     # Show the line chart
     with col2:
         st.subheader("\nBar chart")
-        st.bar_chart(df_pivot)
-
-    # Makes a dataframe from the cyber_incidents database
-    rows = db.fetch_all(
-        "SELECT incident_id, timestamp, severity, category, status, description, reported_by FROM cyber_incidents ORDER BY incident_id")
-
-    # Takes the rows dataframe and turns it into a list of objects for the SecurityIncident class.
-    incidents: list[SecurityIncident] = []
-    for row in rows:
-        incident = SecurityIncident(
-            db_path= "app/data/DATA/intelligence_platform.db",
-            incident_id=row[0],
-            timestamp=row[1],
-            incident_type=row[3],
-            severity=row[2],
-            status=row[4],
-            description=row[5],
-            reported_by=row[6],
-        )
-        incidents.append(incident)
-
-    # Create DataFrame with named columns
-    columns = ["incident_id", "timestamp", "severity", "category", "status", "description", "reported_by"]
-    df = pd.DataFrame(rows, columns=columns)
-
-    # Show DataFrame
+        st.bar_chart(df_chart)
+
+    # Any date range, from hourly to monthly buckets
+    with st.expander("Timeline"):
+        timeline_chart(db, "Cybersecurity")
+
+    # Ranked full-text search over incident descriptions
+    search_text = st.text_input("🔎 Search incidents", placeholder="e.g. phishing email")
+    if search_text:
+        st.dataframe(cached_read(db, search_incidents, search_text), hide_index=True)
+
+    # Show one page of raw data at a time
     with st.expander("See raw data"):
-        st.dataframe(df)
+        raw_incidents = raw_data_grid(db, "Cybersecurity", incidents_repository, ["severity", "status"])
 
     # Allow category selections
     edit_categories = ["Add", "Remove", "Update Status"]
@@ -171,11 +165,11 @@ elif st.session_state.selected_categories == "Cybersecurity":
             check_id = st.form_submit_button("Check Incident ID")
             # Check if the incident is in the database
             if check_id:
-                self = SecurityIncident.get_self(incidents, incident_id)
-                if self is None:
+                incident = raw_incidents.find(incident_id)
+                if incident is None:
                     st.error("Error: Invalid Incident ID.")
                 else:
-                    st.write(incidents[self])
+                    st.write(incident)
 
             submitted = st.form_submit_button("Remove Incident")
 
@@ -192,12 +186,12 @@ elif st.session_state.selected_categories == "Cybersecurity":
                 # Deletes the incident
                 if st.button("Yes"):
                     st.success("Deleting incident...")
-                    self = SecurityIncident.get_self(incidents, incident_id)
+                    incident = raw_incidents.find(incident_id)
                     pause(2.5) # Delay the output
-                    if self is None:
+                    if incident is None:
                         st.error("Error: Invalid Incident ID.")
                     else:
-                        success = incidents[self].save_changes("delete")
+                        success = incident.save_changes("delete")
                         if success is not None:
                             st.success("Incident deletion successful!")
                         else:
@@ -229,23 +223,24 @@ elif st.session_state.selected_categories == "Cybersecurity":
             check_id = st.form_submit_button("Check Incident ID")
             # Check if the incident is in the database
             if check_id:
-                self = SecurityIncident.get_self(incidents, incident_id)
-                if self is None:
+                incident = raw_incidents.find(incident_id)
+                if incident is None:
                     st.error("Error: Invalid Incident ID.")
                 else:
-                    st.write(incidents[self])
+                    st.write(incident)
 
             new_status = st.selectbox("New Status", ["Open", "Investigating", "Closed"])
             submitted = st.form_submit_button("Update Incident")
 
             # Updates the status
             if submitted:
-                self = SecurityIncident.get_self(incidents, incident_id)
-                if self is None:
+                incident = raw_incidents.find(incident_id)
+                if incident is None:
                     st.error("Error: Invalid Incident ID.")
+                # Only changes the (shared) incident once the database has the new status
+                elif incident.save_status(new_status) is None:
+                    st.error("Error: Incident no longer exists.")
                 else:
-                    incidents[self].update_status(new_status)
-                    incidents[self].save_changes("update")
                     st.success(f"Incident {incident_id} updated successfully!")
                     pause(5) # Delay the page rerun
                     st.rerun() # Rerun page
@@ -254,61 +249,32 @@ elif st.session_state.selected_categories == "Cybersecurity":
 # ---------- Data Science Display ----------
 elif st.session_state.selected_categories == "Data Science":
 
-    # Connect database
-    db = DatabaseManager("app/data/DATA/intelligence_platform.db")
-    db.connect()
-
     st.subheader("Datasets by departments who uploaded (Monthly)")
 
     col1, col2 = st.columns(2)
-    # Group datasets by month and who uploaded
-    chart_data = """
-           SELECT strftime('%Y-%m', upload_date) as month, uploaded_by, COUNT(*) as count
-           FROM datasets_metadata
-           GROUP BY month, uploaded_by
-           ORDER BY month
-           """
-    # Connects to database to run chart_data and to make a dataframe
-    df = pd.read_sql_query(chart_data, conn)
+    # Monthly dataset counts per uploader, kept current by triggers
+    matrix = cached_read(db, get_monthly_matrix, "Data Science")
 
     # Plots the charts
-    df_pivot = df.pivot(index="month", columns="uploaded_by", values="count").fillna(0)
+    df_chart = matrix.to_frame()
 
     # Show bar chart
     with col1:
         st.subheader("Line chart")
-        st.line_chart(df_pivot)
+        st.line_chart(df_chart)
 
     # Show the line chart
     with col2:
         st.subheader("\nBar chart")
-        st.bar_chart(df_pivot)
-
-    rows = db.fetch_all(
-        "SELECT dataset_id, name, rows, columns, uploaded_by, upload_date, reported_by FROM datasets_metadata ORDER BY dataset_id")
-
-    # Takes the rows dataframe and turns it into a list of objects for the Dataset class.
-    datasets: list[Dataset] = []
-    for row in rows:
-        dataset = Dataset(
-            db_path="app/data/DATA/intelligence_platform.db",
-            dataset_id=row[0],
-            name=row[1],
-            rows=row[2],
-            columns=row[3],
-            source=row[4],
-            upload_date=row[5],
-            reported_by=row[6],
-        )
-        datasets.append(dataset)
-
-    # Create DataFrame with named columns
-    columns = ["dataset_id", "name", "rows", "columns", "uploaded_by", "upload_date", "reported_by"]
-    df = pd.DataFrame(rows, columns=columns)
-
-    # Show DataFrame
+        st.bar_chart(df_chart)
+
+    # Any date range, from hourly to monthly buckets
+    with st.expander("Timeline"):
+        timeline_chart(db, "Data Science")
+
+    # Show one page of raw data at a time
     with st.expander("See raw data"):
-        st.dataframe(df)
+        raw_datasets = raw_data_grid(db, "Data Science", datasets_repository, ["uploaded_by"])
 
     # Allow category selections
     edit_categories = ["Add", "Remove"]
@@ -320,15 +286,15 @@ elif st.session_state.selected_categories == "Data Science":
         # Creates a form for the user to insert a new dataset into the database
         with st.form("insert_form"):
             name = st.text_input("Department Name")
-            rows = st.text_input("Row Number")
-            columns = st.text_input("Column Number")
+            rows = st.number_input("Row Number", min_value=0, step=1)
+            columns = st.number_input("Column Number", min_value=0, step=1)
             uploaded_by = st.text_input("Uploaded By")
             reported_by = st.text_input("Reported By (optional)")
             submitted = st.form_submit_button("Insert Ticket")
 
             # Checks if required fields are filled
             if submitted:
-                if name or rows or columns or uploaded_by == "":
+                if name == "" or uploaded_by == "":
                     st.error("Error: Please fill all necessary fields.")
                 else:
                     # Inserts the new incident
@@ -364,11 +330,11 @@ elif st.session_state.selected_categories == "Data Science":
             check_id = st.form_submit_button("Check Dataset ID")
             # Check if the dataset is in the database
             if check_id:
-                self = Dataset.get_self(datasets, dataset_id)
-                if self is None:
+                dataset = raw_datasets.find(dataset_id)
+                if dataset is None:
                     st.error("Error: Invalid Dataset ID.")
                 else:
-                    st.write(datasets[self])
+                    st.write(dataset)
 
 
             submitted = st.form_submit_button("Remove Dataset")
@@ -386,12 +352,12 @@ elif st.session_state.selected_categories == "Data Science":
                 # Deletes dataset
                 if st.button("Yes"):
                     st.success("Deleting dataset...")
-                    self = Dataset.get_self(datasets, dataset_id)
+                    dataset = raw_datasets.find(dataset_id)
                     pause(2.5) # Delay the output
-                    if self is None:
+                    if dataset is None:
                         st.error("Error: Invalid Dataset ID.")
                     else:
-                        success = datasets[self].save_changes("delete")
+                        success = dataset.save_changes("delete")
                         if success is not None:
                             st.success("Dataset deletion successful!")
                         else:
@@ -417,63 +383,37 @@ elif st.session_state.selected_categories == "Data Science":
 # ---------- IT Operations Display ----------
 elif st.session_state.selected_categories == "IT Operations":
 
-    # Connect database
-    db = DatabaseManager("app/data/DATA/intelligence_platform.db")
-    db.connect()
-
     st.subheader("IT Operations by Status (Monthly)")
 
     col1, col2 = st.columns(2)
-    # Group incidents by month and category
-    chart_data = """
-           SELECT strftime('%Y-%m', created_at) as month, status, COUNT(*) as count
-           FROM it_tickets
-           GROUP BY month, status
-           ORDER BY month
-           """
-    # Connects to database to run chart_data and to make a dataframe
-    df = pd.read_sql_query(chart_data, conn)
+    # Monthly ticket counts per status, kept current by triggers
+    matrix = cached_read(db, get_monthly_matrix, "IT Operations")
 
     # Plot charts
-    df_pivot = df.pivot(index="month", columns="status", values="count").fillna(0)
+    df_chart = matrix.to_frame()
 
     # Show bar chart
     with col1:
         st.subheader("Line chart")
-        st.line_chart(df_pivot)
+        st.line_chart(df_chart)
 
     # Show the line chart
     with col2:
         st.subheader("\nBar chart")
-        st.bar_chart(df_pivot)
-
-    # Makes a dataframe from the cyber_incidents database
-    rows = db.fetch_all(
-        "SELECT ticket_id, priority, description, status, assigned_to, created_at, resolution_time_hours, reported_by FROM it_tickets ORDER BY ticket_id")
-
-    # Takes the rows dataframe and turns it into a list of objects for the ITTicket class.
-    tickets: list[ITTicket] = []
-    for row in rows:
-        ticket = ITTicket(
-            db_path= "app/data/DATA/intelligence_platform.db",
-            ticket_id=row[0],
-            priority=row[1],
-            description=row[2],
-            status=row[3],
-            assigned_to=row[4],
-            created_at=row[5],
-            resolution_time_hours=row[6],
-            reported_by=row[7],
-        )
-        tickets.append(ticket)
-
-    # Create DataFrame with named columns
-    columns = ["ticket_id", "priority", "description", "status", "assigned_to", "created_at", "resolution_time_hours", "reported_by"]
-    df = pd.DataFrame(rows, columns=columns)
-
-    # Show DataFrame
+        st.bar_chart(df_chart)
+
+    # Any date range, from hourly to monthly buckets
+    with st.expander("Timeline"):
+        timeline_chart(db, "IT Operations")
+
+    # Ranked full-text search over ticket descriptions
+    search_text = st.text_input("🔎 Search tickets", placeholder="e.g. printer offline")
+    if search_text:
+        st.dataframe(cached_read(db, search_tickets, search_text), hide_index=True)
+
+    # Show one page of raw data at a time
     with st.expander("See raw data"):
-        st.dataframe(df)
+        raw_tickets = raw_data_grid(db, "IT Operations", tickets_repository, ["priority", "status"])
 
     # Allow category selections
     edit_categories = ["Add", "Remove", "Update Status"]
@@ -488,7 +428,7 @@ elif st.session_state.selected_categories == "IT Operations":
             description = st.text_area("Description")
             status = st.selectbox("Status", ["In Progress", "Open", "Resolved", "Waiting for User"])
             assigned_to = st.selectbox("Assigned To", ["IT_Support_A", "IT_Support_B", "IT_Support_C"])
-            resolution_time_hours = st.text_input("Resolution Time (HH)")
+            resolution_time_hours = st.number_input("Resolution Time (HH)", min_value=0.0, value=None, step=0.5) # Blank means unresolved
             reported_by = st.text_input("Reported By (optional)")
             submitted = st.form_submit_button("Insert Ticket")
 
@@ -526,11 +466,11 @@ elif st.session_state.selected_categories == "IT Operations":
             check_id = st.form_submit_button("Check Ticket ID")
             # Check if the ticket is in the database
             if check_id:
-                self = ITTicket.get_self(tickets, ticket_id)
-                if self is None:
+                ticket = raw_tickets.find(ticket_id)
+                if ticket is None:
                     st.error("Error: Invalid Dataset ID.")
                 else:
-                    st.write(tickets[self])
+                    st.write(ticket)
 
             submitted = st.form_submit_button("Remove Ticket")
 
@@ -547,12 +487,12 @@ elif st.session_state.selected_categories == "IT Operations":
                 # Deletes the ticket
                 if st.button("Yes"):
                     st.success("Deleting ticket...")
-                    self = ITTicket.get_self(tickets, ticket_id)
+                    ticket = raw_tickets.find(ticket_id)
                     pause(2.5) # Delay the output
-                    if self is None:
+                    if ticket is None:
                         st.error("Error: Invalid Dataset ID.")
                     else:
-                        success = tickets[self].save_changes("delete")
+                        success = ticket.save_changes("delete")
                         if success is not None:
                             st.success("Ticket deletion successful!")
                         else:
@@ -583,23 +523,24 @@ elif st.session_state.selected_categories == "IT Operations":
             check_id = st.form_submit_button("Check Ticket ID")
             # Check if the ticket is in the database
             if check_id:
-                self = ITTicket.get_self(tickets, ticket_id)
-                if self is None:
+                ticket = raw_tickets.find(ticket_id)
+                if ticket is None:
                     st.error("Error: Invalid Dataset ID.")
                 else:
-                    st.write(tickets[self])
+                    st.write(ticket)
 
             new_status = st.selectbox("Status", ["In Progress", "Open", "Resolved", "Waiting for User"])
             submitted = st.form_submit_button("Update Ticket")
 
             if submitted:
                 # Updates the status
-                self = ITTicket.get_self(tickets, int(ticket_id))
-                if self is None:
+                ticket = raw_tickets.find(ticket_id)
+                if ticket is None:
                     st.error("Error: Invalid Dataset ID.")
+                # Only changes the (shared) ticket once the database has the new status
+                elif ticket.save_status(new_status) is None:
+                    st.error("Error: Ticket no longer exists.")
                 else:
-                    tickets[self].update_status(new_status)
-                    tickets[self].save_changes("update")
                     st.success(f"Incident {ticket_id} updated successfully!")
                 pause(2.5)  # Delay the page rerun
                 st.rerun()  # Rerun the page
@@ -0,0 +1,78 @@
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import perf_counter
+from app.data.domains import DOMAINS
+from app.data.migrations import migrate
+from app.data.overview import get_domain_summary
+from my_app.services.database_manager import DatabaseManager
+
+st.set_page_config(page_title="Overview", page_icon="🧭", layout="wide")
+
+# Ensure state keys exist (in case user opens this page first)
+if "logged_in" not in st.session_state:
+    st.session_state.logged_in = False
+if "username" not in st.session_state:
+    st.session_state.username = ""
+
+# Guard: if not logged in, send user back
+if not st.session_state.logged_in:
+    st.error("You must be logged in to view the overview.")
+    if st.button("Go to login page"):
+        st.switch_page("Home.py") # back to the first page
+    st.stop()
+
+# Setup database (borrows connections from the shared pool)
+db = DatabaseManager("app/data/DATA/intelligence_platform.db")
+# Bring the schema up to date (a single PRAGMA read when it is already current)
+with db.connection() as conn:
+    migrate(conn)
+
+# Read summary
+def read_summary(domain_name: str) -> tuple[dict, float]:
+    """Reads one domain's summary on its own pooled connection; runs in a worker thread."""
+    started = perf_counter()
+    with db.connection() as conn:
+        summary = get_domain_summary(conn, domain_name)
+    return summary, perf_counter() - started
+
+st.title("🧭 Overview")
+st.caption("All domains at a glance")
+
+# One panel per domain, filled in as soon as its queries finish
+panels = {}
+for column, domain_name in zip(st.columns(len(DOMAINS)), DOMAINS):
+    with column:
+        st.subheader(domain_name)
+        panels[domain_name] = st.empty()
+        panels[domain_name].info("Loading...")
+
+# Streamlit elements can only be drawn from this thread, so workers only query
+started = perf_counter()
+with ThreadPoolExecutor(max_workers=len(DOMAINS), thread_name_prefix="overview") as pool:
+    futures = {pool.submit(read_summary, domain_name): domain_name for domain_name in DOMAINS}
+    for future in as_completed(futures):
+        domain_name = futures[future]
+        with panels[domain_name].container():
+            try:
+                summary, elapsed = future.result()
+            except Exception as e:
+                st.error(f"Could not load {domain_name}: {e}")
+                continue
+            kpi_1, kpi_2, kpi_3 = st.columns(3)
+            kpi_1.metric("Total", summary["total"])
+            kpi_2.metric("Last 30 days", summary["recent"])
+            if summary["open"] is not None:
+                kpi_3.metric("Open", summary["open"])
+            st.caption(f"Most common: {summary['top_dimension'] or '-'}")
+            st.line_chart(summary["monthly"], x="month", y="count")
+            st.caption(f"Loaded in {elapsed * 1000:.0f} ms")
+st.caption(f"All domains loaded in {(perf_counter() - started) * 1000:.0f} ms")
+
+# Logout button
+with st.sidebar:
+    st.divider()
+    if st.button("Log out"):
+        st.session_state.logged_in = False
+        st.session_state.username = ""
+        st.info("You have been logged out.")
+        st.switch_page("Home.py")
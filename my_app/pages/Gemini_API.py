@@ -1,9 +1,10 @@
+import os
 import streamlit as st
-from app.data.db import connect_database
-from app.data.incidents import get_all_incidents
-from app.data.tickets import get_all_tickets
-from app.data.datasets import get_all_datasets
 from my_app.services.ai_assistant import AIAssistant  # import your wrapper
+from my_app.services.database_manager import DatabaseManager
+from my_app.services.context_builder import ContextBuilder
+from my_app.services.fake_streaming_client import FakeStreamingClient
+from my_app.services.response_cache import ResponseCache
 
 st.set_page_config(page_title="Gemini API", page_icon="🤖", layout="wide")
 
@@ -24,7 +25,20 @@ st.subheader("Gemini API")
 
 # Initialise assistant in session state
 if "assistant" not in st.session_state:
-    st.session_state.assistant = AIAssistant(api_key=st.secrets["GEMINI_API_KEY"])
+    # Setup database (borrows connections from the shared pool)
+    db = DatabaseManager("app/data/DATA/intelligence_platform.db")
+    if os.environ.get("GEMINI_BACKEND") == "fake":
+        # Offline: canned streamed replies, no API key needed
+        st.session_state.assistant = AIAssistant(
+            api_key="", context_builder=ContextBuilder(db, token_budget=1500), client=FakeStreamingClient(),
+        )
+    else:
+        # Replies are cached on disk until the table they are about changes
+        st.session_state.assistant = AIAssistant(
+            api_key=st.secrets["GEMINI_API_KEY"],
+            context_builder=ContextBuilder(db, token_budget=1500),
+            response_cache=ResponseCache(db),
+        )
 
 categories = ["NONE", "Cybersecurity", "Data Science", "IT Operations"]
 
@@ -62,6 +76,29 @@ for message in st.session_state.assistant.get_history():
 with st.sidebar:
     st.title("💬 Chat Controls")
     st.metric("Messages", len(st.session_state.assistant.get_history()))
+    # Size of the table context sent with the last message
+    context = st.session_state.assistant.last_context
+    if context is not None:
+        st.metric("Context tokens", context.tokens, delta=f"-{context.saved_tokens} vs full table", delta_color="inverse")
+    # Size of the whole payload (summary, recent turns and context) sent with the last message
+    turn_metrics = st.session_state.assistant.get_turn_metrics()
+    if turn_metrics:
+        last_turn = turn_metrics[-1]
+        st.metric("Payload tokens", last_turn.total_tokens)
+        st.caption(f"{last_turn.verbatim_turns} recent turns sent in full, {last_turn.summarized_turns} summarized")
+    # Messages over the size limit are cut before they are sent
+    if st.session_state.assistant.last_message_truncated:
+        st.warning("The last message was too long and was shortened before it was sent.")
+    # How quickly the last reply started and finished streaming
+    timing = st.session_state.assistant.last_stream
+    if timing is not None and timing.time_to_first_token is not None:
+        st.metric("Time to first token", f"{timing.time_to_first_token:.2f} s")
+        st.caption(f"Full reply in {timing.total_time:.2f} s ({timing.chunks} chunks)"
+                   + (" from the response cache" if st.session_state.assistant.last_cache_hit else ""))
+    # Replies served without calling the API
+    cache_stats = st.session_state.assistant.get_cache_stats()
+    if cache_stats is not None:
+        st.metric("Cached replies", f"{cache_stats['hits']} / {cache_stats['hits'] + cache_stats['misses']}")
     if st.button("🗑️ Clear Chat", use_container_width=True):
         st.session_state.assistant.clear_history()
         st.rerun()
@@ -73,31 +110,13 @@ if prompt:
     with st.chat_message("user"):
         st.markdown(prompt)
 
-    # Setup database
-    conn = connect_database()
-    if 'data_text' not in st.session_state:
-        st.session_state.data_text = ""
-
-    if st.session_state.selected_categories == "Cybersecurity":
-        df = get_all_incidents(conn)
-        st.session_state.data_text = df.to_csv(index=False)
-    elif st.session_state.selected_categories == "Data Science":
-        df = get_all_datasets(conn)
-        st.session_state.data_text = df.to_csv(index=False)
-    elif st.session_state.selected_categories == "IT Operations":
-        df = get_all_tickets(conn)
-        st.session_state.data_text = df.to_csv(index=False)
-
-    # Send to assistant
-    reply = st.session_state.assistant.send_message(
-        user_message=prompt,
-        category=st.session_state.selected_categories,
-        data_text=st.session_state.data_text
-    )
-
-    # Display assistant reply
+    # Send to assistant (it attaches the schema, statistics and the rows most relevant to the prompt)
+    # and show the reply as it streams in
     with st.chat_message("assistant"):
-        st.markdown(reply)
+        st.write_stream(st.session_state.assistant.stream_message(
+            user_message=prompt,
+            category=st.session_state.selected_categories,
+        ))
 
     st.rerun()
 
@@ -1,14 +1,33 @@
-from typing import List, Dict
-from google import genai
-from google.genai import types
+import time
+from typing import Dict, Iterator, List, NamedTuple
+from my_app.services.context_builder import ContextBuilder, DataContext
+from my_app.services.conversation_memory import ConversationMemory, TurnMetrics
+from my_app.services.response_cache import ResponseCache
+
+class StreamTiming(NamedTuple):
+    """How long one streamed reply took."""
+    time_to_first_token: float | None # Seconds until the first non-empty chunk (None if there was none)
+    total_time: float
+    chunks: int
+
 
 class AIAssistant:
     """Simple wrap around of Gemini API"""
     # Initializes the objects
-    def __init__(self, api_key: str, system_prompt: str = "You are a helpful assistant."):
+    def __init__(self, api_key: str, system_prompt: str = "You are a helpful assistant.", context_builder: ContextBuilder | None = None, memory: ConversationMemory | None = None, client=None, response_cache: ResponseCache | None = None):
         self._system_prompt = system_prompt
-        self._history: List[Dict[str, str]] = []
-        self._client = genai.Client(api_key=api_key)
+        self._history: List[Dict[str, str]] = [] # Full transcript, for display only
+        self._memory = memory or ConversationMemory()
+        if client is None:
+            from google import genai # Only needed for the real backend
+            client = genai.Client(api_key=api_key)
+        self._client = client # Anything with models.generate_content_stream, e.g. FakeStreamingClient
+        self._context_builder = context_builder
+        self._response_cache = response_cache
+        self.last_cache_hit = False
+        self.last_message_truncated = False
+        self.last_context: DataContext | None = None
+        self.last_stream: StreamTiming | None = None
 
     # Set system prompt
     def set_system_prompt(self, prompt: str):
@@ -17,39 +36,100 @@ class AIAssistant:
 
     # Send massage
     def send_message(self, user_message: str, category: str = "General", data_text: str = "") -> str:
-        """Send a message to Gemini and stream back the response."""
-        # Add user message to history
-        self._history.append({"role": "user", "parts": [{"text": user_message}]})
-
-        # Build contents
-        contents = [
-            *self._history,
-            {"role": "user", "parts": [{"text": f"Here is the {category} table:\n{data_text}"}]}
-        ]
+        """Send a message to Gemini and return the whole reply."""
+        return "".join(self.stream_message(user_message, category, data_text))
+
+    # Stream message
+    def stream_message(self, user_message: str, category: str = "General", data_text: str = "") -> Iterator[str]:
+        """
+        Send a message to Gemini and yield the reply in chunks as they arrive.
+
+        The question and reply are added to the history once the stream ends
+        (or is closed early), but only if some text arrived; if the API call
+        fails first, the error is raised and nothing is recorded. Timing is
+        kept in last_stream. A reply found in the
+        response cache is yielded whole, without calling the API. A message
+        over the memory's max_message_tokens is cut first (see
+        last_message_truncated).
+        """
+        started = time.perf_counter()
+        # Cut an oversized message before the cache key, table context and payload are built from it
+        user_message, self.last_message_truncated = self._memory.fit_message(user_message)
+        # Same question, same conversation and unchanged table: reuse the earlier reply
+        cache_key = None
+        self.last_cache_hit = False
+        if self._response_cache is not None:
+            cache_key = self._response_cache.key_for(user_message, category, self._memory.history_hash(), data_text)
+            cached_reply = self._response_cache.get(cache_key)
+            if cached_reply is not None:
+                elapsed = time.perf_counter() - started
+                self.last_cache_hit = True
+                self.last_context = None # Nothing was sent
+                self.last_stream = StreamTiming(elapsed, elapsed, 1)
+                self._history.append({"role": "user", "parts": [{"text": user_message}]})
+                self._history.append({"role": "assistant", "parts": [{"text": cached_reply}]})
+                self._memory.add_turn(user_message, cached_reply)
+                yield cached_reply
+                return
+
+        # Without table text, attach the rows most relevant to the message
+        if not data_text and self._context_builder is not None and category != "General":
+            self.last_context = self._context_builder.build(category, user_message)
+            data_text = self.last_context.text
+
+        # Build contents (recent turns verbatim, older ones summarized, under a token ceiling)
+        contents = self._memory.build_contents([
+            {"role": "user", "parts": [{"text": user_message}]},
+            {"role": "user", "parts": [{"text": f"Here is the {category} table:\n{data_text}"}]},
+        ])
         # API config
         response_stream = self._client.models.generate_content_stream(
             model="gemini-2.5-flash",
-            config=types.GenerateContentConfig(
-                system_instruction=f"You are an {category} data analyst. Your name is Gem."
-            ),
+            config={"system_instruction": f"You are an {category} data analyst. Your name is Gem."},
             contents=contents
         )
 
-        # Collect streaming response
-        full_reply = ""
-        for chunk in response_stream:
-            full_reply += chunk.text
-
-        # Save assistant reply
-        self._history.append({"role": "assistant", "parts": [{"text": full_reply}]})
-        return full_reply
+        # Pass chunks on as they arrive
+        pieces: List[str] = []
+        first_token = None
+        try:
+            for chunk in response_stream:
+                text = chunk.text or ""
+                if not text:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                pieces.append(text)
+                yield text
+            # Only whole replies are cached
+            if cache_key is not None and pieces:
+                self._response_cache.put(cache_key, "".join(pieces))
+        finally:
+            self.last_stream = StreamTiming(first_token, time.perf_counter() - started, len(pieces))
+            # Save the turn, unless no reply arrived (an empty one would end up in later prompts and summaries)
+            if pieces:
+                full_reply = "".join(pieces)
+                self._history.append({"role": "user", "parts": [{"text": user_message}]})
+                self._history.append({"role": "assistant", "parts": [{"text": full_reply}]})
+                self._memory.add_turn(user_message, full_reply)
 
     # Clear history
     def clear_history(self):
         """Clears the history of the API assistant."""
         self._history.clear()
+        self._memory.clear()
 
     # Get history
     def get_history(self) -> List[Dict[str, str]]:
         """Returns the history of the API assistant."""
-        return self._history
\ No newline at end of file
+        return self._history
+
+    # Get turn metrics
+    def get_turn_metrics(self) -> List[TurnMetrics]:
+        """Returns the payload size of every message sent so far."""
+        return self._memory.metrics
+
+    # Get cache stats
+    def get_cache_stats(self) -> dict[str, float] | None:
+        """Returns the response cache's hit/miss counters, or None without a cache."""
+        return None if self._response_cache is None else self._response_cache.stats()
@@ -0,0 +1,177 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from app.data.db import BatchingConnection
+
+class ConnectionPool:
+    """Shares a bounded set of SQLite connections between threads."""
+    # Initializes the objects
+    def __init__(self, db_path: str, max_size: int = 8, timeout: float = 30.0, busy_timeout_ms: int = 5000):
+        self._db_path = db_path
+        self._max_size = max_size
+        self._timeout = timeout
+        self._busy_timeout_ms = busy_timeout_ms
+        self._idle: list[sqlite3.Connection] = []
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    # Open connection
+    def _open(self) -> sqlite3.Connection:
+        """Opens a new connection with the pool settings applied."""
+        # isolation_level=None leaves transaction control to the caller
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=self._busy_timeout_ms / 1000,
+            check_same_thread=False,
+            isolation_level=None,
+            factory=BatchingConnection,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+        conn.execute("PRAGMA journal_mode = WAL") # Readers no longer block the writer
+        conn.execute("PRAGMA synchronous = NORMAL") # Safe in WAL mode and avoids an fsync per commit
+        return conn
+
+    # Open dedicated connection
+    def open_dedicated(self) -> sqlite3.Connection:
+        """
+        Opens a connection with the pool settings that is not counted against max_size.
+
+        For long-lived workers (such as the group-commit writer) that must be
+        able to write while every pooled connection is checked out. The
+        caller closes it.
+        """
+        return self._open()
+
+    # Is healthy
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """Checks that an idle connection can still run a query."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    # Acquire
+    def acquire(self) -> sqlite3.Connection:
+        """Checks out a connection for the calling thread."""
+        # A thread that already holds a connection keeps using it
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            return held
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed.")
+                # Reuse an idle connection if it passes the health check
+                if self._idle:
+                    conn = self._idle.pop()
+                    if self._is_healthy(conn):
+                        break
+                    conn.close()
+                    self._created -= 1
+                    continue
+                # Open a new connection while below the size limit
+                if self._created < self._max_size:
+                    self._created += 1
+                    try:
+                        conn = self._open()
+                    except sqlite3.Error:
+                        self._created -= 1
+                        raise
+                    break
+                # Otherwise wait for another thread to release one
+                if not self._condition.wait(self._timeout):
+                    raise sqlite3.OperationalError(f"Timed out waiting for a connection to {self._db_path}.")
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    # Release
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Returns a connection checked out by the calling thread."""
+        if getattr(self._local, "conn", None) is not conn:
+            raise sqlite3.ProgrammingError("Connection was not checked out by this thread.")
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+
+        # Never hand an open transaction to the next borrower
+        if conn.in_transaction:
+            conn.rollback()
+        with self._condition:
+            if self._closed:
+                conn.close()
+                self._created -= 1
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    # Current
+    def current(self) -> sqlite3.Connection | None:
+        """Returns the connection held by the calling thread, if any."""
+        return getattr(self._local, "conn", None)
+
+    # Connection
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a connection for the duration of a with block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    # Stats
+    def stats(self) -> dict[str, int]:
+        """Returns how many connections are open, idle and in use."""
+        with self._condition:
+            return {
+                "max_size": self._max_size,
+                "open": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+            }
+
+    # Close
+    def close(self) -> None:
+        """Closes idle connections and stops handing out new ones."""
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._created -= 1
+            self._condition.notify_all()
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+# Get pool
+def get_pool(db_path: str, **options) -> ConnectionPool:
+    """Returns the process-wide pool for a database file."""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path, **options)
+            _pools[key] = pool
+        return pool
+
+# Close all pools
+def close_all_pools() -> None:
+    """Closes every pool opened by this process."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,193 @@
+import math
+import threading
+from typing import NamedTuple
+import pandas as pd
+from app.data.domains import DOMAINS, Domain
+from my_app.services.database_manager import DatabaseManager
+from my_app.services.lexical_index import get_lexical_index
+
+# Average characters per token for English text and CSV (close enough for budgeting)
+CHARS_PER_TOKEN = 4
+# Text columns with more distinct values than this get no top-K counts (IDs, free text)
+MAX_CATEGORY_VALUES = 50
+# Characters of a timestamp once written out as 'YYYY-MM-DD HH:MM:SS'
+_TIMESTAMP_CHARS = 19
+
+# Estimate tokens
+def estimate_tokens(text: str) -> int:
+    """Returns a rough token count for a piece of text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class DataContext(NamedTuple):
+    """What the context builder produced for one request."""
+    text: str
+    tokens: int
+    full_tokens: int # Estimated tokens of the whole table as CSV
+    sample_rows: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.full_tokens - self.tokens)
+
+
+class ContextBuilder:
+    """
+    Describes a domain table to the assistant within a token budget.
+
+    Instead of the whole table as CSV it sends, in order of priority: the
+    schema, per-column summary statistics computed in SQL, the top-K values
+    of each category column, and as many of the rows a BM25 index ranks
+    highest for the question as still fit. The summary is reused until the data changes.
+    """
+    # Initializes the objects
+    def __init__(self, db: DatabaseManager, token_budget: int = 1500, top_k: int = 5, max_sample_rows: int = 20):
+        self._db = db
+        self.token_budget = token_budget
+        self.top_k = top_k
+        self.max_sample_rows = max_sample_rows
+        self._summaries: dict[tuple[str, int], tuple[list[str], int]] = {}
+        self._lock = threading.Lock()
+
+    # Build
+    def build(self, domain_name: str, question: str = "") -> DataContext:
+        """Returns the context for one question about a domain."""
+        domain = DOMAINS[domain_name]
+        sections, full_tokens = self._get_summary(domain)
+
+        lines: list[str] = []
+        used = 0
+        for section in sections:
+            cost = estimate_tokens(section) + 1
+            if used + cost > self.token_budget:
+                break
+            lines.append(section)
+            used += cost
+
+        sample = self._sample_rows(domain, question)
+        added = 0
+        if len(sample):
+            csv_lines = sample.to_csv(index=False).strip().split("\n")
+            heading = "Sample rows (most relevant first):\n" + csv_lines[0]
+            cost = estimate_tokens(heading) + 1
+            if used + cost <= self.token_budget:
+                lines.append(heading)
+                used += cost
+                for csv_line in csv_lines[1:]:
+                    cost = estimate_tokens(csv_line) + 1
+                    if used + cost > self.token_budget:
+                        break
+                    lines.append(csv_line)
+                    used += cost
+                    added += 1
+
+        text = "\n".join(lines)
+        if full_tokens <= min(estimate_tokens(text), self.token_budget):
+            return self._whole_table(domain, full_tokens) # Small enough to send as it is
+        return DataContext(text, estimate_tokens(text), full_tokens, added)
+
+    # Whole table
+    def _whole_table(self, domain: Domain, full_tokens: int) -> DataContext:
+        with self._db.connection() as conn:
+            df = pd.read_sql_query(f"SELECT {', '.join(domain.columns)} FROM {domain.table} ORDER BY {domain.key}",
+                                   conn, parse_dates={domain.time_column: {"unit": "s"}})
+        text = f"Table {domain.table} ({domain.name}), all {len(df)} rows:\n" + df.to_csv(index=False)
+        return DataContext(text, estimate_tokens(text), full_tokens, len(df))
+
+    # Get summary
+    def _get_summary(self, domain: Domain) -> tuple[list[str], int]:
+        """Returns the schema/statistics sections and the full-table token estimate."""
+        key = (domain.name, self._db.data_version())
+        with self._lock:
+            cached = self._summaries.get(key)
+        if cached is not None:
+            return cached
+
+        with self._db.connection() as conn:
+            summary = self._read_summary(conn, domain)
+        with self._lock:
+            # Older versions of this domain are stale now
+            for old_key in [old for old in self._summaries if old[0] == domain.name]:
+                del self._summaries[old_key]
+            self._summaries[key] = summary
+        return summary
+
+    # Read summary
+    def _read_summary(self, conn, domain: Domain) -> tuple[list[str], int]:
+        columns = [(row[1], (row[2] or "TEXT").upper()) for row in conn.execute(f"PRAGMA table_info({domain.table})")]
+        numeric = [name for name, sql_type in columns
+                   if sql_type in ("INTEGER", "REAL") and name not in (domain.key, domain.time_column)]
+        text = [name for name, sql_type in columns if sql_type not in ("INTEGER", "REAL")]
+
+        # Every statistic (and the size of the table as CSV) in one scan
+        aggregates = ["COUNT(*)", f"MIN({domain.time_column})", f"MAX({domain.time_column})"]
+        for name in numeric:
+            aggregates += [f"MIN({name})", f"MAX({name})", f"AVG({name})", f"SUM({name} IS NULL)"]
+        for name in text:
+            aggregates += [f"COUNT(DISTINCT {name})", f"SUM({name} IS NULL)"]
+        lengths = [f"IFNULL(LENGTH({name}), 0)" for name, _ in columns if name != domain.time_column]
+        aggregates.append(f"SUM({' + '.join(lengths)})")
+        values = list(conn.execute(f"SELECT {', '.join(aggregates)} FROM {domain.table}").fetchone())
+
+        row_count, first_time, last_time = values[:3]
+        position = 3
+        stats = []
+        for name in numeric:
+            low, high, mean, nulls = values[position:position + 4]
+            position += 4
+            if mean is not None:
+                stats.append(f"- {name}: min {low}, max {high}, mean {mean:.2f}, missing {nulls}")
+        distinct = {}
+        for name in text:
+            distinct[name], nulls = values[position:position + 2]
+            position += 2
+            stats.append(f"- {name}: {distinct[name]} distinct values, missing {nulls or 0}")
+        if first_time is not None:
+            first, last = pd.to_datetime([first_time, last_time], unit="s")
+            stats.insert(0, f"- {domain.time_column}: from {first:%Y-%m-%d} to {last:%Y-%m-%d}")
+
+        # What the whole table would cost as CSV: the values, a comma or newline each, and the timestamps
+        table_chars = (values[position] or 0) + row_count * (len(columns) + _TIMESTAMP_CHARS)
+        full_tokens = math.ceil(table_chars / CHARS_PER_TOKEN)
+
+        sections = [
+            f"Table {domain.table} ({domain.name}), {row_count} rows.\n"
+            f"Columns: {', '.join(f'{name} {sql_type}' for name, sql_type in columns)}",
+            "Column statistics:\n" + "\n".join(stats),
+        ]
+        for name in text:
+            if not 0 < distinct[name] <= MAX_CATEGORY_VALUES:
+                continue
+            rows = conn.execute(
+                f"SELECT IFNULL({name}, 'Unknown'), COUNT(*) FROM {domain.table} GROUP BY 1 ORDER BY 2 DESC LIMIT ?",
+                (self.top_k,),
+            ).fetchall()
+            sections.append(f"Top {name} values: " + ", ".join(f"{value} ({count})" for value, count in rows))
+        return sections, full_tokens
+
+    # Sample rows
+    def _sample_rows(self, domain: Domain, question: str) -> pd.DataFrame:
+        """The top-N rows for the question by BM25 relevance, topped up with the newest rows."""
+        limit = self.max_sample_rows
+        ranked = [record_id for record_id, _ in get_lexical_index(self._db, domain.name).search(question, limit)]
+        frames = []
+        with self._db.connection() as conn:
+            if ranked:
+                placeholders = ", ".join("?" for _ in ranked)
+                matches = pd.read_sql_query(
+                    f"SELECT {', '.join(domain.columns)} FROM {domain.table} WHERE {domain.key} IN ({placeholders})",
+                    conn, params=ranked, parse_dates={domain.time_column: {"unit": "s"}},
+                )
+                # Back into relevance order
+                matches = matches.set_index(domain.key).reindex(ranked).dropna(how="all").reset_index()
+                frames.append(matches)
+            if len(ranked) < limit:
+                frames.append(pd.read_sql_query(
+                    f"SELECT {', '.join(domain.columns)} FROM {domain.table} ORDER BY {domain.time_column} DESC LIMIT ?",
+                    conn, params=(limit,), parse_dates={domain.time_column: {"unit": "s"}},
+                ))
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame(columns=list(domain.columns))
+        sample = pd.concat(frames, ignore_index=True).drop_duplicates(subset=domain.key)
+        return sample.head(limit)
@@ -0,0 +1,143 @@
+import hashlib
+import re
+from typing import Dict, List, NamedTuple
+from my_app.services.context_builder import CHARS_PER_TOKEN, estimate_tokens
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+# First sentence
+def _first_sentence(text: str, limit: int = 160) -> str:
+    """Returns the first sentence of a message, cut to `limit` characters."""
+    text = " ".join((text or "").split())
+    sentence = _SENTENCE_END.split(text, maxsplit=1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit - 1] + "…"
+
+# Message tokens
+def _message_tokens(message: Dict) -> int:
+    return sum(estimate_tokens(part["text"]) for part in message["parts"])
+
+
+class TurnMetrics(NamedTuple):
+    """Size of the payload sent for one turn."""
+    turn: int
+    total_tokens: int
+    history_tokens: int # Verbatim recent turns
+    summary_tokens: int
+    message_tokens: int # This turn's message and table context
+    verbatim_turns: int
+    summarized_turns: int
+
+
+class ConversationMemory:
+    """
+    Bounded chat history for the assistant.
+
+    The last `keep_turns` exchanges are sent word for word. Older exchanges
+    are folded into a running summary (the first sentence of each question
+    and answer), and the whole payload is kept under `max_tokens` by folding
+    more turns, then dropping the oldest summary lines, then cutting the
+    table context. A user message longer than `max_message_tokens` is cut
+    by fit_message() before anything else is built from it.
+    """
+    # Initializes the objects
+    def __init__(self, keep_turns: int = 4, max_tokens: int = 6000, max_summary_tokens: int = 400,
+                 max_message_tokens: int = 2000):
+        self.keep_turns = keep_turns
+        self.max_tokens = max_tokens
+        self.max_summary_tokens = max_summary_tokens
+        self.max_message_tokens = min(max_message_tokens, max_tokens)
+        self._recent: List[Dict] = []
+        self._summary_lines: List[str] = []
+        self._summarized_turns = 0
+        self.metrics: List[TurnMetrics] = []
+
+    # Add turn
+    def add_turn(self, user_message: str, reply: str) -> None:
+        """Remembers one question and answer, folding the oldest turns once there are too many."""
+        self._recent.append({"role": "user", "parts": [{"text": user_message}]})
+        self._recent.append({"role": "assistant", "parts": [{"text": reply}]})
+        while len(self._recent) > self.keep_turns * 2:
+            self._fold_oldest()
+
+    # Fold oldest
+    def _fold_oldest(self) -> None:
+        question, answer = self._recent[0], self._recent[1]
+        del self._recent[:2]
+        self._summary_lines.append(
+            f"- User: {_first_sentence(question['parts'][0]['text'])} / "
+            f"Gem: {_first_sentence(answer['parts'][0]['text'])}")
+        self._summarized_turns += 1
+        while self._summary_lines and estimate_tokens("\n".join(self._summary_lines)) > self.max_summary_tokens:
+            self._summary_lines.pop(0)
+
+    # Fit message
+    def fit_message(self, text: str) -> tuple[str, bool]:
+        """Returns the user message cut to `max_message_tokens`, and whether it was cut."""
+        if estimate_tokens(text) <= self.max_message_tokens:
+            return text, False
+        return text[:self.max_message_tokens * CHARS_PER_TOKEN - 1] + "…", True
+
+    # Summary message
+    def _summary_message(self) -> List[Dict]:
+        if not self._summary_lines:
+            return []
+        text = "Summary of the earlier conversation:\n" + "\n".join(self._summary_lines)
+        return [{"role": "user", "parts": [{"text": text}]}]
+
+    # Build contents
+    def build_contents(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Returns the payload for this turn: summary, recent turns, then `messages`.
+
+        `messages` is this turn's user message and table context; their text
+        is cut from the end if nothing else is left to shrink, so the payload
+        never goes over `max_tokens`.
+        """
+        messages = [{"role": message["role"], "parts": [dict(part) for part in message["parts"]]} for message in messages]
+        message_tokens = sum(_message_tokens(message) for message in messages)
+
+        def history_tokens() -> int:
+            return sum(_message_tokens(message) for message in self._summary_message() + self._recent)
+
+        while self._recent and history_tokens() + message_tokens > self.max_tokens:
+            self._fold_oldest()
+        while self._summary_lines and history_tokens() + message_tokens > self.max_tokens:
+            self._summary_lines.pop(0)
+        overflow = history_tokens() + message_tokens - self.max_tokens
+        for part in (part for message in reversed(messages) for part in reversed(message["parts"])):
+            if overflow <= 0:
+                break
+            part["text"] = part["text"][:max(0, len(part["text"]) - overflow * CHARS_PER_TOKEN)]
+            message_tokens = sum(_message_tokens(message) for message in messages)
+            overflow = history_tokens() + message_tokens - self.max_tokens
+
+        summary = self._summary_message()
+        contents = [*summary, *self._recent, *messages]
+        summary_tokens = sum(_message_tokens(message) for message in summary)
+        recent_tokens = sum(_message_tokens(message) for message in self._recent)
+        self.metrics.append(TurnMetrics(
+            turn=len(self.metrics) + 1,
+            total_tokens=summary_tokens + recent_tokens + message_tokens,
+            history_tokens=recent_tokens,
+            summary_tokens=summary_tokens,
+            message_tokens=message_tokens,
+            verbatim_turns=len(self._recent) // 2,
+            summarized_turns=self._summarized_turns,
+        ))
+        return contents
+
+    # History hash
+    def history_hash(self) -> str:
+        """Returns a hash of what would be sent as history (summary and recent turns), for cache keys."""
+        digest = hashlib.sha256()
+        for message in self._summary_message() + self._recent:
+            digest.update(f"{message['role']}\x1f{message['parts'][0]['text']}\x1e".encode())
+        return digest.hexdigest()
+
+    # Clear
+    def clear(self) -> None:
+        """Forgets the whole conversation."""
+        self._recent.clear()
+        self._summary_lines.clear()
+        self._summarized_turns = 0
+        self.metrics.clear()
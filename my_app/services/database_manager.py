@@ -1,54 +1,214 @@
 import sqlite3
-from typing import Any, Iterable
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator
+import numpy as np
+import pandas as pd
+from app.data.db import bulk_insert, transaction
+from my_app.services.connection_pool import ConnectionPool, get_pool
+from my_app.services.group_commit import get_group_writer
+from my_app.services.query_cache import QueryCache, get_query_cache
 
 class DatabaseManager:
     """Handles SQLite database connections and queries."""
     # Initializes the objects
     def __init__(self, db_path: str):
         self._db_path = db_path
-        self._connection: sqlite3.Connection | None = None
+        self._pool: ConnectionPool | None = None
+
+    # Get database path
+    @property
+    def db_path(self) -> str:
+        """Returns the path of the database file."""
+        return self._db_path
 
     # Connect
     def connect(self) -> None:
-        """Connects to the SQLite database."""
-        if self._connection is None:
-            self._connection = sqlite3.connect(self._db_path)
+        """Attaches to the shared connection pool for the database."""
+        if self._pool is None:
+            self._pool = get_pool(self._db_path)
+
+    # Cache
+    def _cache(self) -> QueryCache:
+        """Returns the shared result cache for the database."""
+        return get_query_cache(self._db_path)
+
+    # Cache stats
+    def cache_stats(self) -> dict[str, float]:
+        """Returns the result cache's hit/miss counters and size."""
+        return self._cache().stats()
+
+    # Data version
+    def data_version(self) -> int:
+        """Returns a number that changes whenever a write is committed (use it in cache keys)."""
+        return self._cache().data_version()
 
     # Close
     def close(self) -> None:
-        """Closes the database connection."""
-        if self._connection is not None:
-            self._connection.close()
-            self._connection = None
+        """Detaches from the pool (the pooled connections stay open)."""
+        self._pool = None
+
+    # Connection
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a pooled connection for the duration of a with block."""
+        if self._pool is None:
+            self.connect()
+        with self._pool.connection() as conn:
+            yield conn
+
+    # Transaction
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Runs every write in the with block as one transaction.
+
+        execute_query() calls made by the same thread inside the block join
+        the transaction, so the whole block costs a single commit.
+        """
+        with self.connection() as conn, transaction(conn):
+            yield conn
 
     # Execute query
     def execute_query(self, sql: str, params: Iterable[Any] = ()):
-        """Execute a write query (INSERT, UPDATE, DELETE)."""
-        if self._connection is None:
+        """
+        Execute a write query (INSERT, UPDATE, DELETE).
+
+        Returns an object with lastrowid and rowcount. When group commit is
+        enabled for the database the write is batched with other threads'
+        writes, unless this thread is already inside transaction().
+        """
+        if self._pool is None:
             self.connect()
-        cur = self._connection.cursor()
-        cur.execute(sql, tuple(params))
-        self._connection.commit()
-        return cur
+        cache = self._cache()
+        cache.before_write()
+        try:
+            held = self._pool.current()
+            if held is None or not held.in_transaction:
+                writer = get_group_writer(self._db_path)
+                if writer is not None:
+                    return writer.execute(sql, params)
+
+            with self.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(sql, tuple(params))
+                conn.commit() # Deferred while inside transaction()
+                return cur
+        finally:
+            # Drop cached results for the tables this write touched
+            cache.after_write(sql)
+
+    # Execute many
+    def execute_many(self, sql: str, rows: Iterable[Iterable[Any]]) -> sqlite3.Cursor:
+        """
+        Run one write statement for every parameter row with executemany.
+
+        The rows share one commit (or join the thread's transaction()), and
+        the returned cursor's rowcount is the total over all rows.
+        """
+        cache = self._cache()
+        cache.before_write()
+        try:
+            with self.connection() as conn, transaction(conn):
+                cur = conn.cursor()
+                cur.executemany(sql, (tuple(row) for row in rows))
+                return cur
+        finally:
+            cache.after_write(sql)
+
+    # Insert many
+    def insert_many(self, table: str, columns: Iterable[str], rows: Iterable[Any], batch_size: int = 1000) -> list[range]:
+        """Insert many rows with executemany in one transaction and return their ID ranges."""
+        cache = self._cache()
+        cache.before_write()
+        try:
+            with self.connection() as conn:
+                return bulk_insert(conn, table, columns, rows, batch_size)
+        finally:
+            cache.after_write(table=table)
+
+    # In transaction
+    def _in_transaction(self) -> bool:
+        """True if the calling thread holds a pooled connection with an open transaction."""
+        held = self._pool.current() if self._pool is not None else None
+        return held is not None and held.in_transaction
 
     # Fetch one
-    def fetch_one(self, sql: str, params: Iterable[Any] = ()):
-        """Collect one row from a database."""
-        # Check if the database is connected
-        if self._connection is None:
-            self.connect()
+    def fetch_one(self, sql: str, params: Iterable[Any] = (), cache: bool = True):
+        """
+        Collect one row from a database (served from the result cache when possible).
+
+        Reads inside transaction() bypass the cache: they can see rows that
+        are not committed yet and may be rolled back.
+        """
+        params = tuple(params)
+        cache = cache and not self._in_transaction()
+        key = ("one", sql, params)
+        if cache:
+            hit, row = self._cache().get(key)
+            if hit:
+                return row
+            token = row
         # Fetches the data
-        cur = self._connection.cursor()
-        cur.execute(sql, tuple(params))
-        return cur.fetchone()
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            row = cur.fetchone()
+        if cache:
+            self._cache().put(key, sql, row, token)
+        return row
 
     # Fetch all
-    def fetch_all(self, sql: str, params: Iterable[Any] = ()):
-        """Collect all rows from a database."""
-        # Check if the database is connected
-        if self._connection is None:
-            self.connect()
+    def fetch_all(self, sql: str, params: Iterable[Any] = (), cache: bool = True):
+        """Collect all rows from a database (served from the result cache when possible, not inside transaction())."""
+        params = tuple(params)
+        cache = cache and not self._in_transaction()
+        key = ("all", sql, params)
+        if cache:
+            hit, rows = self._cache().get(key)
+            if hit:
+                return list(rows)
+            token = rows
         # Fetches the data
-        cur = self._connection.cursor()
-        cur.execute(sql, tuple(params))
-        return cur.fetchall()
\ No newline at end of file
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        if cache:
+            self._cache().put(key, sql, rows, token)
+        return list(rows)
+
+    # Iterate rows
+    def iter_rows(self, sql: str, params: Iterable[Any] = (), batch_size: int = 1000) -> Iterator[tuple]:
+        """
+        Yield rows one at a time, reading batch_size rows from SQLite per fetch.
+
+        The pooled connection is held until the generator is exhausted or
+        closed, so consume it on the thread that started it.
+        """
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, tuple(params))
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    # Iterate frames
+    def iter_frames(self, sql: str, params: Iterable[Any] = (), batch_size: int = 10000) -> Iterator[pd.DataFrame]:
+        """Yield the result as pandas DataFrames of at most batch_size rows."""
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, tuple(params))
+            columns = [description[0] for description in cur.description]
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=columns)
+
+    # Iterate arrays
+    def iter_arrays(self, sql: str, params: Iterable[Any] = (), batch_size: int = 10000) -> Iterator[dict[str, np.ndarray]]:
+        """Yield the result as {column: NumPy array} chunks of at most batch_size rows."""
+        for frame in self.iter_frames(sql, params, batch_size):
+            yield {column: frame[column].to_numpy() for column in frame.columns}
@@ -0,0 +1,54 @@
+import time
+from typing import Dict, Iterator, List, NamedTuple
+
+
+class FakeChunk(NamedTuple):
+    """One streamed piece of a reply, shaped like a Gemini response chunk."""
+    text: str
+
+
+class _FakeModels:
+    # Initializes the objects
+    def __init__(self, client: "FakeStreamingClient"):
+        self._client = client
+
+    # Generate content stream
+    def generate_content_stream(self, model: str, config: Dict, contents: List[Dict]) -> Iterator[FakeChunk]:
+        self._client.calls.append({"model": model, "config": config, "contents": contents})
+        return self._client._stream(contents)
+
+
+class FakeStreamingClient:
+    """
+    Offline stand-in for genai.Client that streams a canned reply.
+
+    Pass it to AIAssistant(client=...) to try the chat page or time the
+    streaming path without an API key or network. The reply is split into
+    words, sent `words_per_chunk` at a time with `chunk_delay` seconds
+    between chunks after a `first_token_delay`. Every request is kept in
+    `calls`.
+    """
+    # Initializes the objects
+    def __init__(self, reply: str | None = None, first_token_delay: float = 0.3,
+                 chunk_delay: float = 0.03, words_per_chunk: int = 3):
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.words_per_chunk = words_per_chunk
+        self.calls: List[Dict] = []
+        self.models = _FakeModels(self)
+
+    # Stream
+    def _stream(self, contents: List[Dict]) -> Iterator[FakeChunk]:
+        reply = self.reply
+        if reply is None:
+            # Echo the question (the second to last message; the last one is the table)
+            question = contents[-2]["parts"][0]["text"] if len(contents) > 1 else contents[-1]["parts"][0]["text"]
+            reply = f"(Offline reply) You asked: {question}"
+        words = reply.split(" ")
+        time.sleep(self.first_token_delay)
+        for start in range(0, len(words), self.words_per_chunk):
+            if start:
+                time.sleep(self.chunk_delay)
+            text = " ".join(words[start:start + self.words_per_chunk])
+            yield FakeChunk(text if start + self.words_per_chunk >= len(words) else text + " ")
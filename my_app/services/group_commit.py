@@ -0,0 +1,147 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+from app.data.db import transaction
+from my_app.services.connection_pool import ConnectionPool, get_pool
+
+class WriteResult(NamedTuple):
+    """Outcome of one statement written by the group-commit writer."""
+    lastrowid: int | None
+    rowcount: int
+
+
+class GroupCommitWriter:
+    """
+    Background writer that commits concurrent statements together.
+
+    It writes on its own connection rather than one from the pool: callers
+    wait for it while holding pooled connections, so borrowing from the
+    same bounded pool could leave it waiting on them forever.
+    """
+    # Initializes the objects
+    def __init__(self, pool: ConnectionPool, window_ms: float = 5.0, max_batch: int = 64):
+        self._conn = pool.open_dedicated()
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._batches = 0
+        self._statements = 0
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    # Submit
+    def submit(self, sql: str, params: Iterable[Any] = ()) -> Future:
+        """Queues a write and returns a future for its WriteResult."""
+        if not self._thread.is_alive():
+            raise sqlite3.ProgrammingError("Group-commit writer has been closed.")
+        future: Future = Future()
+        self._queue.put((sql, tuple(params), future))
+        return future
+
+    # Execute
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> WriteResult:
+        """Queues a write and waits until its batch has been committed."""
+        return self.submit(sql, params).result()
+
+    # Run
+    def _run(self) -> None:
+        """Collects statements until the window closes or the batch is full."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    # Flush
+    def _flush(self, batch: list[tuple[str, tuple, Future]]) -> None:
+        """Writes a batch in one transaction and resolves each caller's future."""
+        outcomes: list[tuple[Future, WriteResult | Exception]] = []
+        try:
+            with transaction(self._conn):
+                cur = self._conn.cursor()
+                for sql, params, future in batch:
+                    # A savepoint per statement keeps one bad write from failing the others
+                    cur.execute("SAVEPOINT group_write")
+                    try:
+                        cur.execute(sql, params)
+                        outcomes.append((future, WriteResult(cur.lastrowid, cur.rowcount)))
+                    except sqlite3.Error as e:
+                        cur.execute("ROLLBACK TO group_write")
+                        outcomes.append((future, e))
+                    cur.execute("RELEASE group_write")
+        except Exception as e:
+            # The commit itself failed, so nothing in the batch was written
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._statements += len(batch)
+        for future, outcome in outcomes:
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    # Stats
+    def stats(self) -> dict[str, float]:
+        """Returns how many statements and commits the writer has made."""
+        return {
+            "batches": self._batches,
+            "statements": self._statements,
+            "statements_per_commit": self._statements / self._batches if self._batches else 0.0,
+        }
+
+    # Close
+    def close(self) -> None:
+        """Flushes queued writes and stops the background thread."""
+        self._queue.put(None)
+        self._thread.join()
+        self._conn.close()
+
+
+_writers: dict[str, GroupCommitWriter] = {}
+_writers_lock = threading.Lock()
+
+# Enable group commit
+def enable_group_commit(db_path: str, window_ms: float = 5.0, max_batch: int = 64) -> GroupCommitWriter:
+    """Starts (or returns) the shared group-commit writer for a database file."""
+    key = str(Path(db_path).resolve())
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = GroupCommitWriter(get_pool(db_path), window_ms, max_batch)
+            _writers[key] = writer
+        return writer
+
+# Get group writer
+def get_group_writer(db_path: str) -> GroupCommitWriter | None:
+    """Returns the group-commit writer for a database file, if one is enabled."""
+    return _writers.get(str(Path(db_path).resolve()))
+
+# Disable group commit
+def disable_group_commit(db_path: str) -> None:
+    """Flushes and stops the group-commit writer for a database file."""
+    with _writers_lock:
+        writer = _writers.pop(str(Path(db_path).resolve()), None)
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,166 @@
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+import numpy as np
+from app.data.domains import DOMAINS
+from app.data.versions import get_table_version
+from my_app.services.database_manager import DatabaseManager
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Words too common to say anything about a row
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its me my of on or our show "
+    "that the their there this to was were what when where which who why with you".split()
+)
+
+# Text that is indexed for each domain (columns the app does not edit after insert)
+INDEXED_COLUMNS = {
+    "Cybersecurity": ("category", "severity", "description"),
+    "IT Operations": ("priority", "assigned_to", "description"),
+    "Data Science": ("name", "uploaded_by"),
+}
+
+# Tokenize
+def tokenize(text: str) -> list[str]:
+    """Lower-cases text and splits it into words, without stopwords."""
+    words = _WORD.findall((text or "").lower().replace("_", " "))
+    return [word for word in words if word not in STOPWORDS]
+
+
+class LexicalIndex:
+    """
+    BM25 index over the text of one domain table, kept in NumPy arrays.
+
+    Each term keeps a postings list of (row position, term frequency)
+    arrays. refresh() runs when the table's version (see app/data/versions.py)
+    changes; it compares the table's IDs with the indexed ones, reads the text
+    of new rows only and marks deleted rows as tombstones instead of rebuilding.
+    """
+    # Initializes the objects
+    def __init__(self, db: DatabaseManager, domain_name: str, k1: float = 1.5, b: float = 0.75):
+        self._db = db
+        self._domain = DOMAINS[domain_name]
+        self._columns = INDEXED_COLUMNS[domain_name]
+        self.k1 = k1
+        self.b = b
+
+        self._ids = np.empty(0, dtype=np.int64)
+        self._lengths = np.empty(0, dtype=np.float64)
+        self._alive = np.empty(0, dtype=bool)
+        # term -> [positions, frequencies] chunks, merged on first use after a refresh
+        self._postings: dict[str, list[tuple[np.ndarray, np.ndarray]]] = {}
+        self._table_version: int | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    # Refresh
+    def refresh(self) -> None:
+        """Indexes rows added since the last refresh and drops deleted ones (no-op if the table did not change)."""
+        domain = self._domain
+        with self._db.connection() as conn:
+            version = get_table_version(conn, domain.table)
+        with self._lock:
+            if version == self._table_version:
+                return
+            existing = np.fromiter((row[0] for row in self._db.iter_rows(
+                f"SELECT {domain.key} FROM {domain.table}")), dtype=np.int64)
+            self._alive &= np.isin(self._ids, existing)
+            self._add_rows(np.setdiff1d(existing, self._ids[self._alive]))
+            self._table_version = version
+
+    # Add rows
+    def _add_rows(self, new_ids: np.ndarray, chunk_size: int = 500) -> None:
+        if len(new_ids) == 0:
+            return
+        domain = self._domain
+        ids, lengths = [], []
+        term_positions: dict[str, list[int]] = {}
+        term_counts: dict[str, list[int]] = {}
+        position = len(self._ids)
+        select = f"SELECT {domain.key}, {', '.join(self._columns)} FROM {domain.table}"
+        if len(self._ids) == 0:
+            batches = [(select, ())] # First build: read the whole table in one pass
+        else:
+            batches = [(f"{select} WHERE {domain.key} IN ({', '.join('?' * len(chunk))})", tuple(chunk.tolist()))
+                       for chunk in np.array_split(new_ids, math.ceil(len(new_ids) / chunk_size))]
+        rows = (row for sql, params in batches for row in self._db.iter_rows(sql, params))
+        for row in rows:
+            words = tokenize(" ".join(str(value) for value in row[1:] if value is not None))
+            for term, count in Counter(words).items():
+                term_positions.setdefault(term, []).append(position)
+                term_counts.setdefault(term, []).append(count)
+            ids.append(row[0])
+            lengths.append(len(words))
+            position += 1
+        if not ids:
+            return
+
+        for term, positions in term_positions.items():
+            self._postings.setdefault(term, []).append(
+                (np.array(positions, dtype=np.int64), np.array(term_counts[term], dtype=np.float64)))
+        self._ids = np.concatenate([self._ids, np.array(ids, dtype=np.int64)])
+        self._lengths = np.concatenate([self._lengths, np.array(lengths, dtype=np.float64)])
+        self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+
+    # Get postings
+    def _get_postings(self, term: str) -> tuple[np.ndarray, np.ndarray] | None:
+        chunks = self._postings.get(term)
+        if not chunks:
+            return None
+        if len(chunks) > 1:
+            merged = (np.concatenate([chunk[0] for chunk in chunks]), np.concatenate([chunk[1] for chunk in chunks]))
+            self._postings[term] = [merged]
+        return self._postings[term][0]
+
+    # Search
+    def search(self, query: str, top_n: int = 10) -> list[tuple[int, float]]:
+        """
+        Returns up to top_n (row ID, BM25 score) pairs, best first.
+
+        Rows that share no word with the query are never returned.
+        """
+        self.refresh()
+        terms = set(tokenize(query))
+        with self._lock:
+            total = len(self)
+            if not terms or total == 0:
+                return []
+            average_length = self._lengths[self._alive].mean() or 1.0
+            scores = np.zeros(len(self._ids), dtype=np.float64)
+            for term in terms:
+                postings = self._get_postings(term)
+                if postings is None:
+                    continue
+                positions, frequencies = postings
+                live = self._alive[positions]
+                positions, frequencies = positions[live], frequencies[live]
+                if len(positions) == 0:
+                    continue
+                idf = math.log(1 + (total - len(positions) + 0.5) / (len(positions) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[positions] / average_length)
+                scores[positions] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > top_n:
+                matched = matched[np.argpartition(scores[matched], -top_n)[-top_n:]]
+            best = matched[np.argsort(-scores[matched], kind="stable")]
+            return [(int(self._ids[position]), float(scores[position])) for position in best]
+
+
+_indexes: dict[tuple[str, str], LexicalIndex] = {}
+_indexes_lock = threading.Lock()
+
+# Get lexical index
+def get_lexical_index(db: DatabaseManager, domain_name: str) -> LexicalIndex:
+    """Returns the process-wide index of a domain, built on first use."""
+    key = (str(Path(db.db_path).resolve()), domain_name)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = LexicalIndex(db, domain_name)
+            _indexes[key] = index
+        return index
@@ -0,0 +1,202 @@
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable
+
+# Tables a SELECT reads from
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+# Table a write statement (or a trigger body statement) changes
+_WRITE_TABLE = re.compile(
+    r"\b(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+([A-Za-z_][A-Za-z0-9_]*)",
+    re.IGNORECASE,
+)
+
+class QueryCache:
+    """LRU cache of read query results for one database file."""
+    # Initializes the objects
+    def __init__(self, db_path: str, max_entries: int = 256, max_rows: int = 200_000):
+        self._max_entries = max_entries
+        self._max_rows = max_rows
+        self._entries: OrderedDict[Hashable, tuple[Any, frozenset[str], int]] = OrderedDict()
+        self._keys_by_table: dict[str, set[Hashable]] = {}
+        self._rows = 0
+        self._lock = threading.Lock()
+        self._trigger_targets: dict[str, set[str]] | None = None
+        # Generations: bumped by every in-process write, and by every full clear (epoch)
+        self._generation = 0
+        self._changed_at: dict[str, int] = {}
+        self._epoch = 0
+
+        # A connection that never writes: its data_version changes whenever any other connection commits
+        self._watcher = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._data_version = self._read_data_version()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # Read data version
+    def _read_data_version(self) -> int:
+        return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    # Check external writes
+    def _check_external_writes(self) -> None:
+        """Drops everything if a write was committed that this cache was not told about."""
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._clear()
+
+    # Data version
+    def data_version(self) -> int:
+        """Returns a number that changes whenever any connection commits to the database."""
+        with self._lock:
+            return self._read_data_version()
+
+    # Get
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Returns (True, result) on a hit and (False, token) on a miss.
+
+        Read the data after the miss and pass the token to put(), so a result
+        read before a write committed is not stored after it.
+        """
+        with self._lock:
+            self._check_external_writes()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, (self._epoch, self._generation)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    # Put
+    def put(self, key: Hashable, sql: str, result: Any, token: tuple[int, int]) -> None:
+        """
+        Stores a result, evicting the least recently used entries when full.
+
+        The result is dropped if the cache was cleared or a table it reads
+        was written since get() handed out the token.
+        """
+        tables = frozenset(name.lower() for name in _READ_TABLES.findall(sql))
+        if not tables:
+            return # Nothing to invalidate it by, so never cache it
+        size = len(result) if isinstance(result, list) else 1
+        if size > self._max_rows:
+            return
+
+        epoch, generation = token
+        with self._lock:
+            if epoch != self._epoch or any(self._changed_at.get(table, -1) > generation for table in tables):
+                return # May have been read before a write that has since committed
+            self._discard(key)
+            self._entries[key] = (result, tables, size)
+            self._rows += size
+            for table in tables:
+                self._keys_by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self._max_entries or self._rows > self._max_rows:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    # Discard
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, tables, size = entry
+        self._rows -= size
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    # Clear
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_table.clear()
+        self._rows = 0
+        self._trigger_targets = None # The schema may have changed too
+        self._epoch += 1
+        self.invalidations += 1
+
+    # Trigger targets
+    def _tables_changed_by(self, table: str) -> set[str]:
+        """Returns the table plus every table its triggers write to (e.g. rollups)."""
+        if self._trigger_targets is None:
+            self._trigger_targets = {}
+            rows = self._watcher.execute("SELECT tbl_name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall()
+            for trigger_table, trigger_sql in rows:
+                targets = {name.lower() for name in _WRITE_TABLE.findall(trigger_sql or "")}
+                self._trigger_targets.setdefault(trigger_table.lower(), set()).update(targets)
+
+        changed, pending = set(), [table]
+        while pending:
+            name = pending.pop()
+            if name not in changed:
+                changed.add(name)
+                pending.extend(self._trigger_targets.get(name, ()))
+        return changed
+
+    # Before write
+    def before_write(self) -> None:
+        """Called before an in-process write so results from commits by others are dropped first."""
+        with self._lock:
+            self._check_external_writes()
+
+    # After write
+    def after_write(self, sql: str | None = None, table: str | None = None) -> None:
+        """
+        Invalidates the results that depend on a table this process just wrote.
+
+        The known data version is left alone: PRAGMA data_version can rise
+        once for several commits, so the commit is not told apart from one
+        by another process, and the next get() clears everything.
+        """
+        if table is None and sql is not None:
+            match = _WRITE_TABLE.search(sql)
+            table = match.group(1) if match else None
+
+        with self._lock:
+            if table is None:
+                self._clear() # Unknown target (DDL, script...), so drop everything
+            else:
+                self._generation += 1
+                for name in self._tables_changed_by(table.lower()):
+                    self._changed_at[name] = self._generation
+                    for key in list(self._keys_by_table.get(name, ())):
+                        self._discard(key)
+                self.invalidations += 1
+
+    # Stats
+    def stats(self) -> dict[str, float]:
+        """Returns hit/miss counters and the current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "rows": self._rows,
+            }
+
+
+_caches: dict[str, QueryCache] = {}
+_caches_lock = threading.Lock()
+
+# Get query cache
+def get_query_cache(db_path: str, **options) -> QueryCache:
+    """Returns the process-wide result cache for a database file."""
+    key = str(Path(db_path).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = QueryCache(db_path, **options)
+            _caches[key] = cache
+        return cache
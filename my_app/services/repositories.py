@@ -0,0 +1,271 @@
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from my_app.services.database_manager import DatabaseManager
+from my_app.models.security_incident import SecurityIncident
+from my_app.models.it_ticket import ITTicket
+from my_app.models.dataset import Dataset
+
+class Repository(ABC):
+    """
+    Loads and saves the model objects of one domain table.
+
+    Keeps an identity map of the objects it has handed out, so a row that is
+    read twice is the same object both times (refreshed with the latest
+    values). The map holds weak references, so objects are dropped as soon
+    as nothing else uses them. The map is shared by every session, so
+    objects only change after a write has succeeded.
+    """
+    table: str = ""
+    key: str = ""
+    columns: tuple[str, ...] = ()
+    insert_columns: tuple[str, ...] = ()
+    model: type = object
+
+    # Initializes the objects
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+        self._identity: weakref.WeakValueDictionary[int, Any] = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    # For path
+    @classmethod
+    def for_path(cls, db_path: str) -> "Repository":
+        """Returns the process-wide repository of this type for a database file."""
+        key = (cls, str(Path(db_path).resolve()))
+        with _repositories_lock:
+            repository = _repositories.get(key)
+            if repository is None:
+                repository = cls(DatabaseManager(db_path))
+                _repositories[key] = repository
+            return repository
+
+    # From row
+    @abstractmethod
+    def _from_row(self, row: tuple) -> Any:
+        """Builds a model object from a row in `columns` order."""
+
+    # Hydrate
+    def hydrate(self, row: tuple) -> Any:
+        """Returns the mapped object for a row, building it the first time it is seen and refreshing it after."""
+        fresh = self._from_row(row)
+        with self._lock:
+            obj = self._identity.get(row[0])
+            if obj is None:
+                self._identity[row[0]] = fresh
+                return fresh
+            obj.refresh_from(fresh)
+            return obj
+
+    # Select
+    def _select(self) -> str:
+        return f"SELECT {', '.join(self.columns)} FROM {self.table}"
+
+    # Track
+    def track(self, obj: Any) -> None:
+        """Adds an object that now has a database ID to the identity map."""
+        with self._lock:
+            self._identity[obj.get_id()] = obj
+
+    # Forget
+    def forget(self, record_id: int | None) -> None:
+        """Drops a deleted row's object from the identity map."""
+        with self._lock:
+            self._identity.pop(record_id, None)
+
+    # Existing IDs
+    def existing_ids(self, record_ids: Iterable[int], chunk_size: int = 500) -> set[int]:
+        """Returns which of the IDs still have a row (read uncached, so it sees this transaction)."""
+        record_ids = list(record_ids)
+        found: set[int] = set()
+        for i in range(0, len(record_ids), chunk_size):
+            chunk = record_ids[i:i + chunk_size]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self._db.fetch_all(f"SELECT {self.key} FROM {self.table} WHERE {self.key} IN ({placeholders})",
+                                      chunk, cache=False)
+            found.update(row[0] for row in rows)
+        return found
+
+    # Update SQL
+    def update_sql(self) -> str | None:
+        """Returns the UPDATE statement that saves a changed object, or None if the table has none."""
+        if "status" not in self.columns:
+            return None
+        return f"UPDATE {self.table} SET status = ? WHERE {self.key} = ?"
+
+    # Update row
+    def update_row(self, obj: Any) -> tuple:
+        """Returns the parameters of update_sql() for an object."""
+        return obj.get_status(), obj.get_id()
+
+    # Insert row
+    @abstractmethod
+    def insert_row(self, obj: Any) -> tuple:
+        """Returns the values of `insert_columns` for a new object."""
+
+    # Get
+    def get(self, record_id: int) -> Any | None:
+        """Returns the object with this ID (with its current values), or None if there is no such row."""
+        # Always read the row (a primary-key lookup): another session may have changed it
+        row = self._db.fetch_one(f"{self._select()} WHERE {self.key} = ?", (record_id,))
+        return self.hydrate(row) if row is not None else None
+
+    # Find
+    def find(self, record_id: int | str) -> Any | None:
+        """Looks up an ID typed by the user; returns None if it is not a valid ID."""
+        if isinstance(record_id, str):
+            record_id = record_id.strip()
+            if not record_id.isdigit(): # Checks if the ID is a digit
+                return None
+            record_id = int(record_id)
+        return self.get(record_id)
+
+    # Load all
+    def load_all(self) -> list[Any]:
+        """Returns every row of the table as model objects, in ID order."""
+        rows = self._db.fetch_all(f"{self._select()} ORDER BY {self.key}")
+        return [self.hydrate(row) for row in rows]
+
+    # Iterate all
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Any]:
+        """Yields every row of the table as a model object without loading them all."""
+        for row in self._db.iter_rows(f"{self._select()} ORDER BY {self.key}", batch_size=batch_size):
+            yield self.hydrate(row)
+
+    # Add
+    def add(self, obj: Any) -> int | None:
+        """Inserts a new object and gives it the ID the database chose."""
+        placeholders = ", ".join("?" for _ in self.insert_columns)
+        result = self._db.execute_query(
+            f"INSERT INTO {self.table} ({', '.join(self.insert_columns)}) VALUES ({placeholders})",
+            self.insert_row(obj),
+        )
+        obj.set_id(result.lastrowid)
+        self.track(obj)
+        return obj.get_id()
+
+    # Update status
+    def update_status(self, obj: Any, new_status: str | None = None) -> int | None:
+        """
+        Saves a status for the object; returns its ID, or None if the row no longer exists.
+
+        With new_status the object is only changed once the row has been
+        updated, so a failed write leaves it as it was.
+        """
+        status = obj.get_status() if new_status is None else new_status
+        result = self._db.execute_query(self.update_sql(), (status, obj.get_id()))
+        if not result.rowcount:
+            return None
+        obj.update_status(status)
+        return obj.get_id()
+
+    # Delete
+    def delete(self, obj: Any) -> int | None:
+        """Deletes the object's row; returns its ID, or None if there was no such row."""
+        result = self._db.execute_query(f"DELETE FROM {self.table} WHERE {self.key} = ?", (obj.get_id(),))
+        self.forget(obj.get_id())
+        return obj.get_id() if result.rowcount else None
+
+    # Save
+    def save(self, obj: Any, change_type: str) -> int | None:
+        """Runs an "add", "delete" or "update" change for the object."""
+        change_type = change_type.lower()
+        if change_type == "add":
+            return self.add(obj)
+        elif change_type == "delete":
+            return self.delete(obj)
+        elif change_type == "update" and self.update_sql() is not None:
+            return self.update_status(obj)
+        return None
+
+
+class IncidentRepository(Repository):
+    """Persistence for cybersecurity incidents."""
+    table = "cyber_incidents"
+    key = "incident_id"
+    columns = ("incident_id", "timestamp", "severity", "category", "status", "description", "reported_by")
+    insert_columns = ("severity", "category", "status", "description", "reported_by")
+    model = SecurityIncident
+
+    def _from_row(self, row: tuple) -> SecurityIncident:
+        return SecurityIncident(
+            db_path=self._db.db_path,
+            incident_id=row[0],
+            timestamp=row[1],
+            incident_type=row[3],
+            severity=row[2],
+            status=row[4],
+            description=row[5],
+            reported_by=row[6],
+        )
+
+    def insert_row(self, incident: SecurityIncident) -> tuple:
+        # If user chose not to enter reported by
+        return (incident.get_severity(), incident.get_category(), incident.get_status(),
+                incident.get_description(), incident.get_reporter() or None)
+
+
+class TicketRepository(Repository):
+    """Persistence for IT tickets."""
+    table = "it_tickets"
+    key = "ticket_id"
+    columns = ("ticket_id", "priority", "description", "status", "assigned_to", "created_at", "resolution_time_hours", "reported_by")
+    insert_columns = ("priority", "description", "status", "assigned_to", "resolution_time_hours", "reported_by")
+    model = ITTicket
+
+    def _from_row(self, row: tuple) -> ITTicket:
+        return ITTicket(
+            db_path=self._db.db_path,
+            ticket_id=row[0],
+            priority=row[1],
+            description=row[2],
+            status=row[3],
+            assigned_to=row[4],
+            created_at=row[5],
+            resolution_time_hours=row[6],
+            reported_by=row[7],
+        )
+
+    def insert_row(self, ticket: ITTicket) -> tuple:
+        return (ticket.get_priority(), ticket.get_description(), ticket.get_status(), ticket.get_assigned_to(),
+                ticket.get_resolution_time_hours(), ticket.get_reporter() or None)
+
+
+class DatasetRepository(Repository):
+    """Persistence for dataset metadata."""
+    table = "datasets_metadata"
+    key = "dataset_id"
+    columns = ("dataset_id", "name", "rows", "columns", "uploaded_by", "upload_date", "reported_by")
+    insert_columns = ("name", "rows", "columns", "uploaded_by", "reported_by")
+    model = Dataset
+
+    def _from_row(self, row: tuple) -> Dataset:
+        return Dataset(
+            db_path=self._db.db_path,
+            dataset_id=row[0],
+            name=row[1],
+            rows=row[2],
+            columns=row[3],
+            source=row[4],
+            upload_date=row[5],
+            reported_by=row[6],
+        )
+
+    def insert_row(self, dataset: Dataset) -> tuple:
+        return (dataset.get_name(), dataset.get_rows(), dataset.get_columns(), dataset.get_source(),
+                dataset.get_reporter() or None)
+
+
+_repositories: dict[tuple[type, str], Repository] = {}
+_repositories_lock = threading.Lock()
+
+
+# Get repository
+def get_repository(obj: Any, db_path: str | None = None) -> Repository:
+    """Returns the repository that persists a model object."""
+    for repository_type in (IncidentRepository, TicketRepository, DatasetRepository):
+        if isinstance(obj, repository_type.model):
+            return repository_type.for_path(db_path or obj.get_db_path())
+    raise TypeError(f"No repository for {type(obj).__name__} objects")
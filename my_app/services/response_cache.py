@@ -0,0 +1,133 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from app.data.domains import DOMAINS
+from app.data.versions import get_table_version
+from my_app.services.database_manager import DatabaseManager
+
+DEFAULT_CACHE_PATH = "app/data/DATA/assistant_cache.db"
+
+# Normalize prompt
+def normalize_prompt(prompt: str) -> str:
+    """Lower-cases a prompt and drops extra spaces and trailing punctuation, so rewordings of case or spacing match."""
+    return re.sub(r"\s+", " ", (prompt or "").lower()).strip().rstrip("?!. ")
+
+
+class ResponseCache:
+    """
+    Assistant replies stored in their own SQLite file, with LRU and TTL eviction.
+
+    A reply is looked up by a hash of the normalized prompt, the domain, that
+    domain table's version (see app/data/versions.py) and the conversation
+    so far, so any write to the table or a different conversation misses.
+    Entries older than `ttl_seconds` are dropped, and beyond `max_entries`
+    the least recently used go first.
+    """
+    # Initializes the objects
+    def __init__(self, db: DatabaseManager | None = None, path: str = DEFAULT_CACHE_PATH,
+                 max_entries: int = 500, ttl_seconds: int = 24 * 3600):
+        self._db = db
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS responses (
+            cache_key TEXT PRIMARY KEY,
+            reply TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            last_used INTEGER NOT NULL
+        )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_lookup_ms = 0.0
+
+    # Table version
+    def _table_version(self, category: str) -> int:
+        domain = DOMAINS.get(category)
+        if domain is None or self._db is None:
+            return 0 # Not about a table (e.g. "General")
+        with self._db.connection() as conn:
+            return get_table_version(conn, domain.table)
+
+    # Key for
+    def key_for(self, prompt: str, category: str, history_hash: str = "", data_text: str = "") -> str:
+        """Returns the cache key of a prompt asked about a domain after a given conversation."""
+        parts = [
+            normalize_prompt(prompt),
+            category,
+            str(self._table_version(category)),
+            history_hash,
+            hashlib.sha256(data_text.encode()).hexdigest() if data_text else "",
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    # Get
+    def get(self, key: str) -> str | None:
+        """Returns the cached reply, or None on a miss (including an expired entry)."""
+        started = time.perf_counter()
+        now = int(time.time())
+        with self._lock:
+            row = self._conn.execute("SELECT reply, created_at FROM responses WHERE cache_key = ?", (key,)).fetchone()
+            if row is not None and row[1] < now - self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+            else:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE cache_key = ?", (now, key))
+                self.hits += 1
+            self.last_lookup_ms = (time.perf_counter() - started) * 1000
+        return None if row is None else row[0]
+
+    # Put
+    def put(self, key: str, reply: str) -> None:
+        """Stores a reply, then evicts expired and least recently used entries."""
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (cache_key, reply, created_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, reply, now, now),
+                )
+                expired = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                overflow = self._conn.execute("""
+                DELETE FROM responses WHERE cache_key IN (
+                    SELECT cache_key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """, (self.max_entries,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.evictions += expired.rowcount + overflow.rowcount
+
+    # Clear
+    def clear(self) -> None:
+        """Removes every cached reply."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    # Stats
+    def stats(self) -> dict[str, float]:
+        """Returns hit/miss counters and the current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "last_lookup_ms": self.last_lookup_ms,
+            }
@@ -0,0 +1,43 @@
+from typing import Any, Callable, Iterable
+import streamlit as st
+from my_app.services.database_manager import DatabaseManager
+
+# How long a result may be served before it is read again, even if nothing was written
+CACHE_TTL_SECONDS = 600
+# Most results kept per cached function (oldest are dropped first)
+CACHE_MAX_ENTRIES = 256
+
+# Run cached
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _run_cached(db_path: str, name: str, args: tuple, kwargs: tuple, data_version: int, _reader: Callable) -> Any:
+    """
+    Runs a reader once per (database, reader, arguments, data version) for every session.
+
+    `_reader` is left out of the cache key (Streamlit skips arguments that
+    start with an underscore); `name` identifies it instead.
+    """
+    db = DatabaseManager(db_path)
+    with db.connection() as conn:
+        return _reader(conn, *args, **dict(kwargs))
+
+# Fetch all cached
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _fetch_all_cached(db_path: str, sql: str, params: tuple, data_version: int) -> list[tuple]:
+    return DatabaseManager(db_path).fetch_all(sql, params)
+
+# Cached read
+def cached_read(db: DatabaseManager, reader: Callable, *args, **kwargs) -> Any:
+    """
+    Call reader(conn, *args, **kwargs) through the cache shared by all sessions.
+
+    The key includes the database's data version, so any committed write
+    makes the next call read fresh data. Arguments must be hashable by
+    Streamlit (strings, numbers, dates, tuples).
+    """
+    name = f"{reader.__module__}.{reader.__qualname__}"
+    return _run_cached(db.db_path, name, args, tuple(sorted(kwargs.items())), db.data_version(), _reader=reader)
+
+# Cached fetch all
+def cached_fetch_all(db: DatabaseManager, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+    """DatabaseManager.fetch_all through the cache shared by all sessions."""
+    return _fetch_all_cached(db.db_path, sql, tuple(params), db.data_version())
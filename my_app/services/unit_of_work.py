@@ -0,0 +1,134 @@
+from typing import Any
+from my_app.services.database_manager import DatabaseManager
+from my_app.services.repositories import Repository, get_repository
+
+class UnitOfWork:
+    """
+    Collects added, changed and removed model objects and saves them together.
+
+    commit() writes everything in one transaction: one executemany per
+    statement type and table instead of one commit per object. Use it as a
+    context manager to commit on success and discard the changes on error.
+    """
+    # Initializes the objects
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+        # Keyed by id(obj) so registering an object twice keeps one entry (in first-seen order)
+        self._new: dict[int, Any] = {}
+        self._dirty: dict[int, Any] = {}
+        self._deleted: dict[int, Any] = {}
+
+    # Register new
+    def register_new(self, obj: Any) -> None:
+        """Marks an object to be inserted."""
+        self._new[id(obj)] = obj
+
+    # Register dirty
+    def register_dirty(self, obj: Any) -> None:
+        """Marks a changed object to be saved (new objects are inserted as they are)."""
+        if id(obj) not in self._new and id(obj) not in self._deleted:
+            self._dirty[id(obj)] = obj
+
+    # Register deleted
+    def register_deleted(self, obj: Any) -> None:
+        """Marks an object to be deleted (a new one is simply never inserted)."""
+        if self._new.pop(id(obj), None) is not None:
+            return
+        self._dirty.pop(id(obj), None)
+        self._deleted[id(obj)] = obj
+
+    # Register
+    def register(self, obj: Any, change_type: str) -> None:
+        """Registers a change by the same names save_changes uses: "add", "update" or "delete"."""
+        change_type = change_type.lower()
+        if change_type == "add":
+            self.register_new(obj)
+        elif change_type == "update":
+            self.register_dirty(obj)
+        elif change_type == "delete":
+            self.register_deleted(obj)
+        else:
+            raise ValueError(f"Unknown change type: {change_type}")
+
+    def __len__(self) -> int:
+        return len(self._new) + len(self._dirty) + len(self._deleted)
+
+    # Group by repository
+    def _by_repository(self, objects: dict[int, Any]) -> dict[Repository, list[Any]]:
+        groups: dict[Repository, list[Any]] = {}
+        for obj in objects.values():
+            groups.setdefault(get_repository(obj, self._db.db_path), []).append(obj)
+        return groups
+
+    # Commit
+    def commit(self) -> list[tuple[Any, str, int | None]]:
+        """
+        Write every registered change in one transaction.
+
+        New objects get their IDs, and the identity maps are updated, only
+        once the transaction has committed; if it fails no object is changed.
+
+        Returns:
+            list: (object, "add" | "update" | "delete", ID or None) per object;
+                the ID is None when the update or delete found no row
+        """
+        outcomes: list[tuple[Any, str, int | None]] = []
+        repositories: list[Repository] = [] # Repository of each outcome
+        with self._db.transaction():
+            for repository, objects in self._by_repository(self._new).items():
+                # The new IDs come back as consecutive ranges, in insert order
+                id_ranges = self._db.insert_many(repository.table, repository.insert_columns,
+                                                 [repository.insert_row(obj) for obj in objects])
+                new_ids = (record_id for id_range in id_ranges for record_id in id_range)
+                for obj, record_id in zip(objects, new_ids):
+                    outcomes.append((obj, "add", record_id))
+                    repositories.append(repository)
+
+            for repository, objects in self._by_repository(self._dirty).items():
+                update_sql = repository.update_sql()
+                found = repository.existing_ids(obj.get_id() for obj in objects) if update_sql else set()
+                if found:
+                    self._db.execute_many(update_sql, [repository.update_row(obj) for obj in objects
+                                                       if obj.get_id() in found])
+                for obj in objects:
+                    outcomes.append((obj, "update", obj.get_id() if obj.get_id() in found else None))
+                    repositories.append(repository)
+
+            for repository, objects in self._by_repository(self._deleted).items():
+                found = repository.existing_ids(obj.get_id() for obj in objects)
+                if found:
+                    self._db.execute_many(f"DELETE FROM {repository.table} WHERE {repository.key} = ?",
+                                          [(record_id,) for record_id in found])
+                for obj in objects:
+                    outcomes.append((obj, "delete", obj.get_id() if obj.get_id() in found else None))
+                    repositories.append(repository)
+
+        # Committed: now the objects and identity maps can follow
+        for repository, (obj, change, record_id) in zip(repositories, outcomes):
+            if change == "add":
+                obj.set_id(record_id)
+                repository.track(obj)
+            elif change == "delete":
+                repository.forget(obj.get_id())
+        self._clear()
+        return outcomes
+
+    # Rollback
+    def rollback(self) -> None:
+        """Forgets every registered change without writing anything."""
+        self._clear()
+
+    # Clear
+    def _clear(self) -> None:
+        self._new.clear()
+        self._dirty.clear()
+        self._deleted.clear()
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()